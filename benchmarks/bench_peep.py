@@ -0,0 +1,322 @@
+""" Benchmarks for peep throughput, latency and memory
+
+Runs `legacy.peep` and `core.Peeper` over a fixed set of objects and records,
+for each, the wall time, the peak memory allocated while peeping and the time
+until the first line of output. Results are written as JSON so that runs can
+be compared:
+
+    python benchmarks/bench_peep.py --output before.json
+    python benchmarks/bench_peep.py --compare before.json
+
+Cases that need numpy or pandas are skipped if they aren't installed. Arrays
+and DataFrames go up to `--max-bytes`, which is 1 MB by default so that a
+quick run stays quick. Use `--max-bytes 1G` for the full range.
+
+Import time, measured in a fresh interpreter, and the cost of rendering a
+line of output with and without color are recorded too, unless
+`--skip-startup` is given.
+"""
+import argparse
+from contextlib import redirect_stdout
+import datetime
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from peepdis import legacy, rendering  # noqa: E402
+from peepdis.core import Peeper  # noqa: E402
+from peepdis.datastructures import Output  # noqa: E402
+from tests.test_peeper import Square  # noqa: E402
+
+_sizes = {"1K": 2 ** 10, "1M": 2 ** 20, "100M": 100 * 2 ** 20, "1G": 2 ** 30}
+
+
+def _load_blog_code():
+    """ Import `blog/blog_code.py`, which needs numpy and pandas """
+    path = os.path.join(ROOT, "blog", "blog_code.py")
+    spec = importlib.util.spec_from_file_location("blog_code", path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        return None
+    return module
+
+
+def _synthetic_class(n_members):
+    """ A class with `n_members` members, half attributes and half methods """
+    namespace = {}
+    for i in range(n_members // 2):
+        namespace[f"attr_{i}"] = i
+        namespace[f"method_{i}"] = lambda self, i=i: i
+    return type(f"Synthetic{n_members}", (), namespace)
+
+
+def build_cases(max_bytes):
+    """ Return a dict of case name to a function that builds the object """
+    cases = {
+        "square": lambda: Square(3, 4),
+        "synthetic_10k": lambda: _synthetic_class(10_000)(),
+        # a module whose callables all need arguments, so peeping it calls
+        # nothing with side effects, unlike numpy's `test`
+        "math_module": lambda: math,
+    }
+    blog_code = _load_blog_code()
+    if blog_code is not None:
+        cases["rectangle"] = lambda: blog_code.Rectangle(3.0, 4.0)
+        cases["weather_series"] = lambda: blog_code.WeatherSeries(
+            [67, 69, 70, 70, 71, 70]
+        )
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    for label, n_bytes in _sizes.items():
+        if n_bytes > max_bytes:
+            continue
+        n_floats = n_bytes // 8
+        if np is not None:
+            cases[f"ndarray_{label}"] = lambda n=n_floats: np.arange(n, dtype=float)
+        if np is not None and pd is not None:
+            cases[f"dataframe_{label}"] = lambda n=n_floats: pd.DataFrame(
+                {"a": np.arange(n // 2, dtype=float), "b": np.ones(n // 2)}
+            )
+    return cases
+
+
+class _FirstWrite(io.StringIO):
+    """ File that records when it was first written to """
+
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    def write(self, s):
+        if self.first is None:
+            self.first = time.perf_counter()
+        return super().write(s)
+
+
+def run_legacy(obj):
+    """ Return the time until `legacy.peep` wrote its first line """
+    file = _FirstWrite()
+    start = time.perf_counter()
+    legacy.peep(obj, file=file)
+    return file.first - start if file.first is not None else None
+
+
+def run_core(obj):
+    """ Return the time until `Peeper.iter_peep` yielded its first `Output` """
+    start = time.perf_counter()
+    first = None
+    for _ in Peeper(obj).iter_peep():
+        if first is None:
+            first = time.perf_counter() - start
+    return first
+
+
+runners = {"legacy": run_legacy, "core": run_core}
+
+
+def measure(runner, make_obj, repeat):
+    """ Time `runner` on a fresh object `repeat` times, keeping the best run,
+    then run it once more under `tracemalloc` for the peak memory
+    """
+    walls, firsts = [], []
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            obj = make_obj()
+            start = time.perf_counter()
+            first = runner(obj)
+            walls.append(time.perf_counter() - start)
+            firsts.append(first)
+        obj = make_obj()
+        tracemalloc.start()
+        try:
+            runner(obj)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    best = walls.index(min(walls))
+    return {"wall": walls[best], "first_output": firsts[best], "peak_bytes": peak}
+
+
+def run(cases, repeat=3, selected_runners=None):
+    results = []
+    for case, make_obj in cases.items():
+        for name, runner in runners.items():
+            if selected_runners and name not in selected_runners:
+                continue
+            result = {"case": case, "runner": name}
+            result.update(measure(runner, make_obj, repeat))
+            results.append(result)
+            print(_format_result(result), file=sys.stderr)
+    return results
+
+
+_imports = ("import peepdis", "from peepdis import peep")
+
+
+def measure_import(statement, repeat):
+    """ Best time of `statement` over `repeat` fresh interpreters """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - start)"
+    )
+    walls = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        walls.append(float(process.stdout))
+    return min(walls)
+
+
+def measure_render(n_lines, repeat, color):
+    """ Best time per line to render `n_lines` outputs """
+    outputs = [Output(f"method_{i}", str(i), callable_=True) for i in range(n_lines)]
+    rendering.set_color(color)
+    try:
+        walls = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for output in outputs:
+                output.render()
+            walls.append(time.perf_counter() - start)
+    finally:
+        rendering.set_color(None)
+    return min(walls) / n_lines
+
+
+def run_startup(repeat=3):
+    results = []
+    for statement in _imports:
+        wall = measure_import(statement, repeat)
+        results.append(_startup_result(statement, "import", wall))
+    for color in (True, False):
+        wall = measure_render(10_000, repeat, color)
+        runner = "color" if color else "plain"
+        results.append(_startup_result("render line", runner, wall))
+    for result in results:
+        print(_format_result(result), file=sys.stderr)
+    return results
+
+
+def _startup_result(case, runner, wall):
+    return {
+        "case": case,
+        "runner": runner,
+        "wall": wall,
+        "first_output": None,
+        "peak_bytes": None,
+    }
+
+
+def _format_result(result):
+    first = result["first_output"]
+    first_str = f"{first * 1e3:10.2f}" if first is not None else f"{'-':>10}"
+    peak = result["peak_bytes"]
+    peak_str = f"{peak / 2 ** 20:10.2f}" if peak is not None else f"{'-':>10}"
+    return (
+        f"{result['case']:<20} {result['runner']:<8} "
+        f"{result['wall'] * 1e3:10.4f} ms {first_str} ms to first "
+        f"{peak_str} MiB peak"
+    )
+
+
+def compare(results, baseline, tolerance):
+    """ Print each result against `baseline`, returning the regressions """
+    previous = {(r["case"], r["runner"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["case"], result["runner"]))
+        if before is None:
+            continue
+        for metric in ("wall", "first_output", "peak_bytes"):
+            if not before.get(metric) or result[metric] is None:
+                continue
+            ratio = result[metric] / before[metric]
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = "  REGRESSION"
+                regressions.append((result["case"], result["runner"], metric))
+            print(
+                f"{result['case']:<20} {result['runner']:<8} {metric:<14} "
+                f"x{ratio:6.2f}{flag}"
+            )
+    return regressions
+
+
+def _parse_bytes(value):
+    value = value.upper().rstrip("B")
+    if value in _sizes:
+        return _sizes[value]
+    return int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--max-bytes", type=_parse_bytes, default="1M")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="*", help="only run these cases")
+    parser.add_argument("--runners", nargs="*", choices=sorted(runners))
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of results to compare to")
+    parser.add_argument(
+        "--skip-startup",
+        action="store_true",
+        help="don't measure import time and per-line rendering cost",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="fractional slowdown allowed before flagging a regression",
+    )
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.max_bytes)
+    if args.cases:
+        cases = {k: v for k, v in cases.items() if k in args.cases}
+    results = run(cases, args.repeat, args.runners)
+    if not args.skip_startup:
+        results += run_startup(args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
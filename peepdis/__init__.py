@@ -1,3 +1,35 @@
-from peepdis.legacy import peep
+""" Terminal object inspector
+
+The public functions are imported from their modules on first use, so that
+`import peepdis` stays cheap.
+"""
+from importlib import import_module
 
 name = "peep-dis"
+
+_lazy = {
+    "peep": "peepdis.legacy",
+    "iter_peep": "peepdis.core",
+    "apeep": "peepdis.core",
+    "peep_many": "peepdis.batch",
+    "peep_tree": "peepdis.tree",
+    "watch": "peepdis.watch",
+    "browse": "peepdis.lazy",
+}
+
+__all__ = sorted(_lazy)
+
+
+def __getattr__(attr):
+    try:
+        module = _lazy[attr]
+    except KeyError:
+        raise AttributeError(f"module 'peepdis' has no attribute {attr!r}")
+    value = getattr(import_module(module), attr)
+    # cache it, so `__getattr__` isn't called for it again
+    globals()[attr] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
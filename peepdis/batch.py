@@ -0,0 +1,238 @@
+""" Peeping many objects of the same type into one table """
+from collections import Counter
+from copy import deepcopy
+from functools import partial
+import math
+import os
+import reprlib
+
+from peepdis.execution import EvaluationTimeout, call_with_timeout, open_executor
+from peepdis.introspection import (
+    classify,
+    get_signature,
+    member_names,
+    required_args,
+)
+from peepdis.rendering import colorize, shorten
+
+
+class Failed:
+    """ Stands in for a value whose evaluation raised or timed out """
+
+    def __init__(self, message, timed_out=False):
+        self.message = message
+        self.timed_out = timed_out
+
+    def __repr__(self):
+        return f"<{self.message}>"
+
+
+class Table:
+    """ Columns of values, one for each member, with a row for each object """
+
+    def __init__(self, columns, index=None):
+        self.columns = columns
+        length = len(next(iter(columns.values()))) if columns else 0
+        self.index = list(index) if index is not None else list(range(length))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(self.index)
+
+    def rows(self):
+        """ Yield `(index, values)` for each row """
+        yield from zip(self.index, zip(*self.columns.values()))
+
+    def to_frame(self):
+        """ Return the table as a pandas DataFrame """
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, index=self.index)
+
+    def describe(self):
+        """ Summary statistics of each column, as a `Table` with a row for each
+        statistic
+
+        Numeric columns get their mean, standard deviation, minimum and
+        maximum, computed with numpy when it's installed, and other columns
+        the number of unique values and the most common one.
+        """
+        stats = {name: _describe(values) for name, values in self.columns.items()}
+        index = [
+            "count",
+            "errors",
+            "mean",
+            "std",
+            "min",
+            "max",
+            "unique",
+            "top",
+        ]
+        columns = {
+            name: [column.get(stat) for stat in index]
+            for name, column in stats.items()
+        }
+        return Table(columns, index)
+
+    def render(self, max_rows=20, max_width=20):
+        names = list(self.columns)
+        widths = [max(len(name), 1) for name in names]
+        cells = []
+        for i, (index, values) in enumerate(self.rows()):
+            if i == max_rows:
+                break
+            row = [_cell(value, max_width) for value in values]
+            widths = [max(w, len(cell)) for w, cell in zip(widths, row)]
+            cells.append((str(index), row))
+        index_width = max([len(index) for index, _ in cells] + [0])
+        header = " " * index_width + " " + " ".join(
+            colorize(name.ljust(w), "cyan") for name, w in zip(names, widths)
+        )
+        lines = [header]
+        for index, row in cells:
+            lines.append(
+                index.ljust(index_width)
+                + " "
+                + " ".join(cell.ljust(w) for cell, w in zip(row, widths))
+            )
+        if len(self) > max_rows:
+            lines.append(colorize(f"... {len(self) - max_rows} more rows", "grey"))
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return self.render()
+
+
+_repr = reprlib.Repr()
+
+
+def _cell(value, max_width):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return shorten(_repr.repr(value), max_len=max_width)
+
+
+def _describe(values):
+    failed = sum(isinstance(v, Failed) for v in values)
+    present = [v for v in values if not isinstance(v, Failed) and v is not None]
+    stats = {"count": len(present), "errors": failed}
+    if present and all(_is_number(v) for v in present):
+        stats.update(_numeric_stats(present))
+    else:
+        counts = Counter(_hashable(v) for v in present)
+        stats["unique"] = len(counts)
+        if counts:
+            stats["top"] = counts.most_common(1)[0][0]
+    return stats
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _numeric_stats(values):
+    try:
+        import numpy as np
+    except ImportError:
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((v - mean) ** 2 for v in values) / len(values)
+        return {
+            "mean": mean,
+            "std": math.sqrt(variance),
+            "min": min(values),
+            "max": max(values),
+        }
+    arr = np.asarray(values, dtype=float)
+    return {
+        "mean": float(arr.mean()),
+        "std": float(arr.std()),
+        "min": float(arr.min()),
+        "max": float(arr.max()),
+    }
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def zero_arg_members(obj, builtins=False, privates=False, properties=False):
+    """ Names of the attributes of `obj`, and of the methods it has that can be
+    called without arguments
+    """
+    names = []
+    for name in member_names(obj, builtins, privates):
+        kind = classify(obj, name)
+        if kind == "property" and not properties:
+            continue
+        if kind in ("method", "builtin"):
+            sig = get_signature(obj, name, getattr(obj, name))
+            if sig is None or required_args(sig):
+                continue
+        names.append(name)
+    return names
+
+
+def peep_many(
+    objs,
+    members=None,
+    timeout=None,
+    executor="inline",
+    workers=None,
+    properties=False,
+    privates=False,
+):
+    """ Evaluate the same members of each of `objs` into a `Table`, with a row
+    for each object and a column for each member
+
+    The members are found once, from the first object: its attributes and
+    the methods that take no arguments, unless `members` names them. Each
+    object is copied once and all of its methods are called on that copy.
+    `executor` and `workers` spread the objects across a pool, as for `peep`.
+    """
+    objs = list(objs)
+    if not objs:
+        return Table({})
+    if members is None:
+        members = zero_arg_members(objs[0], privates=privates, properties=properties)
+    methods = {
+        name for name in members if classify(objs[0], name) in ("method", "builtin")
+    }
+    evaluate = partial(
+        _evaluate_row, members=members, methods=methods, timeout=timeout
+    )
+    columns = {name: [] for name in members}
+    # sent to worker processes in chunks, rather than one object at a time
+    chunksize = max(1, len(objs) // (4 * (workers or os.cpu_count() or 1)))
+    with open_executor(executor, workers) as pool:
+        for row in pool.map(evaluate, objs, chunksize=chunksize):
+            for column, value in zip(columns.values(), row):
+                column.append(value)
+    return Table(columns)
+
+
+def _evaluate_row(obj, members, methods=(), timeout=None):
+    try:
+        obj = deepcopy(obj)
+    except Exception as e:
+        return [Failed(f"copy raised {e!r}")] * len(members)
+    return [_evaluate_value(obj, name, name in methods, timeout) for name in members]
+
+
+def _evaluate_value(obj, name, call, timeout):
+    try:
+        value = call_with_timeout(getattr, obj, name, timeout=timeout)
+        if call:
+            value = call_with_timeout(value, timeout=timeout)
+    except EvaluationTimeout as e:
+        return Failed(f"timed out after {e.timeout:.3g}s", timed_out=True)
+    except Exception as e:
+        return Failed(f"raises {e!r}")
+    return value
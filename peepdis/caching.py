@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from threading import RLock
+import weakref
+
+from peepdis.fingerprint import fingerprint
+
+
+class ResultCache:
+    """ LRU cache of peep results, keyed on object identity and options
+
+    Each entry also records a fingerprint of the object's state when it was
+    peeped, and is only used while the object still has that fingerprint.
+    Objects that can't be fingerprinted are never cached.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, obj, options=()):
+        """ Return the result stored for `obj` peeped with `options`, or
+        `None` if there isn't one or `obj` has changed since
+        """
+        key = (id(obj), options)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        ref, state, result = entry
+        if ref() is not obj or fingerprint(obj) != state:
+            self._discard(key)
+            return None
+        with self._lock:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, obj, options, result):
+        state = fingerprint(obj)
+        if state is None:
+            return
+        key = (id(obj), options)
+        try:
+            ref = weakref.ref(obj, lambda _: self._discard(key))
+        except TypeError:
+            # keeping it alive stops its id being reused by another object
+            ref = _StrongRef(obj)
+        with self._lock:
+            self._entries[key] = (ref, state, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _StrongRef:
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __call__(self):
+        return self._obj
+
+
+result_cache = ResultCache()
+
+
+def get_cache(cache):
+    """ Resolve the `cache` argument of peep: `True` for the shared cache, a
+    `ResultCache`, or `False` for none
+    """
+    if cache is True:
+        return result_cache
+    if cache is False or cache is None:
+        return None
+    if isinstance(cache, ResultCache):
+        return cache
+    raise TypeError(f"cache must be a bool or ResultCache, not {cache!r}")
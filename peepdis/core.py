@@ -1,47 +1,345 @@
+from contextlib import nullcontext
 from copy import deepcopy
-from inspect import getfullargspec
-from types import BuiltinFunctionType, BuiltinMethodType, FunctionType, MethodType
+from functools import partial
+import inspect
+from inspect import Parameter, isawaitable
+import sys
+from time import monotonic, perf_counter
+from types import (
+    BuiltinFunctionType,
+    BuiltinMethodType,
+    FunctionType,
+    MethodType,
+    ModuleType,
+)
 
 from typing import Any, Callable, Dict, Tuple, Type
 
+from peepdis import forging
 from peepdis.preferences import _PreferencesMixin
-from peepdis.datastructures import Arg, ArgDict, Output
+from peepdis.datastructures import Arg, ArgDict, Output, OutputIndex
+from peepdis.introspection import (
+    classify,
+    get_signature,
+    kind_of,
+    member_names,
+    required_args,
+    type_key,
+)
+from peepdis.profiling import MemberProfile, Profile, Timer, measure, tracing
+from peepdis.rendering import LineBuffer, colorize_as
+from peepdis.scheduling import cheapest_first, cost_model, overdue_message
+from peepdis.summaries import summarize
+from peepdis.tracking import snapshot, state_change
+from peepdis.execution import (
+    EvaluationTimeout,
+    call_in_fork,
+    call_with_timeout,
+    check_isolation,
+    open_executor,
+    run_coroutine,
+    worker_task,
+)
 
 
-# TODO: feature to check for state modifications by copying, then running method, then checking equality on attributes
 # TODO: FIX for correct output from debug script
 # TODO: should attrs and methods include builtins or should there be a
 # TODO: verbose=False should exclude anything that's null, and builtins=False should exclude anything that's builtin. Verbose should be used to filter after eval
-# TODO: ensure that forge is only forging positional args
 # TODO: for data structures that contain multiple types, attempt to forge them, maybe using hypothesis strategies?
 
 
-def peep(obj, verbose=False, forge=False):
+def peep(
+    obj, verbose=False, forge=False, isolation="deepcopy", profile=False, **kwargs
+):
+    """ Print the members of `obj`, taking the options of `Peeper.iter_peep`
+
+    With `profile`, a table of the slowest members is printed afterwards.
+    """
+    peeper = Peeper(obj, isolation=isolation)
+    peeper.print(verbose, forge=forge, profile=profile, **kwargs)
+    if profile:
+        print(peeper.profile.table())
+
+
+def iter_peep(obj, forge=False, isolation="deepcopy", **kwargs):
+    """ Yield an `Output` for each member of `obj` as soon as it's evaluated """
+    peeper = Peeper(obj, isolation=isolation)
+    yield from peeper.iter_peep(forge, **kwargs)
+
+
+async def apeep(obj, forge=False, **kwargs):
+    """ Evaluate the members of `obj` on the running event loop, returning the
+    `Peeper` once every awaitable has been awaited
+    """
     peeper = Peeper(obj)
-    peeper.peep(forge)
-    peeper.print(verbose)
+    await peeper.apeep(forge, **kwargs)
+    return peeper
 
 
 class PeeperMixin(dict):
-    def __init__(self, obj):
+    def __init__(self, obj, isolation="deepcopy"):
         super().__init__()
-        self.obj = deepcopy(obj)
-        self.dir = set(dir(obj))
+        check_isolation(isolation)
+        self.isolation = isolation
+        self.timer = Timer()
+        with self.timer.phase("copy"):
+            self.obj = self._isolate(obj)
+        self.dir = set(member_names(obj))
+
+    def _isolate(self, obj):
+        # with fork isolation, each evaluation happens in a copy-on-write child,
+        # and modules can't be copied
+        if self.isolation == "deepcopy" and not isinstance(obj, ModuleType):
+            return deepcopy(obj)
+        return obj
+
+    def _snapshot(self, method):
+        """ Fingerprint the state of the object `method` is bound to """
+        owner = getattr(method, "__self__", None)
+        if owner is None or isinstance(owner, ModuleType):
+            return None
+        return snapshot(owner)
+
+    def _state_change(self, before, method):
+        """ How the object `method` is bound to has changed since `before` """
+        if before is None:
+            return None
+        # `self.obj` is left untouched when the call was made on a copy
+        reference = self.obj if self.isolation == "deepcopy" else None
+        return state_change(
+            before, method.__self__, getattr(reference, "__self__", None)
+        )
+
+    def _call_and_render(self, func, *args, **kwargs):
+        """ Call `func` and return the `repr` of the result, or the result
+        itself if it's awaitable, for the caller to await
+        """
+        with self.timer.phase("call"):
+            result = func(*args, **kwargs)
+        if isawaitable(result):
+            return result
+        with self.timer.phase("render"):
+            summary = summarize(result)
+            return repr(result) if summary is None else summary
 
 
 class Peeper(PeeperMixin, _PreferencesMixin):
-    def __init__(self, obj):
+    """ Evaluates and indexes every member of an object
+
+    `isolation` controls how members are kept from altering the object:
+    "deepcopy" copies it before each callable is run, and "fork" (POSIX only)
+    evaluates each member in a forked child that shares the object's memory
+    copy-on-write. With fork isolation, only the rendered `str` of each value
+    is sent back from the child.
+
+    With a `store` (True for the default `peepdis.store.MemberStore`), what
+    was learned about the members of the same type in earlier sessions is
+    read at startup: members that failed recently are skipped, and arguments
+    that were forged before are reused. What's learned this time is saved
+    after each peep.
+
+    Each `Output` is stored once, in the peeper itself, and `attrs`,
+    `methods`, `errors`, `builtins` and `unevaluated` look their values up
+    there by name. Large values are replaced by their bounded rendering as
+    outputs are stored, so that the peeper doesn't keep the object's data
+    alive, unless `keep_values` is True.
+    """
+
+    def __init__(self, obj, isolation="deepcopy", store=None, keep_values=False):
         # TODO: should I replace self with CallablePeeper?
-        super().__init__(obj)
-        self.attrs = dict()
-        self.methods = dict()
-        self.errors = dict()
-        self.builtins = dict()
+        super().__init__(obj, isolation=isolation)
+        self.keep_values = keep_values
+        self.attrs = OutputIndex(self)
+        self.methods = OutputIndex(self)
+        self.errors = OutputIndex(self)
+        self.builtins = OutputIndex(self)
+        self.unevaluated = OutputIndex(self)
+        self.overdue = []
+        self.history = {}
+        self.store = None
+        self._type_key = type_key(obj)
+        if store is not None and store is not False:
+            from peepdis.store import get_store, type_version
+
+            self.store = get_store(store)
+            self._version = type_version(obj)
+            self.history = self.store.load(self._type_key, self._version)
+
+    def peep(self, forge=False, **kwargs):
+        for _ in self.iter_peep(forge, **kwargs):
+            pass
+
+    def iter_peep(
+        self,
+        forge=False,
+        timeout=None,
+        executor="inline",
+        workers=None,
+        properties=False,
+        profile=False,
+        track=False,
+        awaitables=False,
+        keep=True,
+        deadline=None,
+    ):
+        """ Evaluate each member, yielding its `Output` as soon as it's ready
 
-    def peep(self, forge=False):
-        for name in self.dir:
-            output = self.evaluate(name, forge=forge)
-            self._index(output)
+        `timeout` is a time budget in seconds for each member, `executor` and
+        `workers` choose how members are evaluated concurrently, and
+        properties are only evaluated if `properties` is True. The time spent
+        on each member is always recorded in `Output.timings`, and `profile`
+        adds its peak memory allocation. With `track`, the attributes each
+        method changed are recorded in `Output.state_change`.
+
+        With `awaitables`, coroutines and other awaitables returned by methods
+        and properties are awaited concurrently on a private event loop, and
+        outputs are yielded once they're all done. See `apeep`. Members are
+        then evaluated in the loop's thread, so `executor` and `workers` can't
+        be given.
+
+        Outputs are kept in the peeper, unless `keep` is False, so that memory
+        use doesn't grow with the number of members.
+
+        `deadline` is a time budget in seconds for the whole peep. Attributes
+        are evaluated first, then the other members from the one expected to
+        be quickest, going by how long they took in earlier peeps of the same
+        type. Each member's timeout is cut to the time left, and the members
+        left once it has passed aren't evaluated, and are listed in `overdue`.
+        """
+        self.overdue = []
+        if awaitables and deadline is not None:
+            raise ValueError("`deadline` isn't supported with `awaitables`")
+        if awaitables and (executor != "inline" or workers is not None):
+            raise ValueError(
+                "`executor` and `workers` aren't supported with `awaitables`"
+            )
+        if awaitables:
+            outputs = run_coroutine(
+                self.apeep(
+                    forge,
+                    timeout=timeout,
+                    properties=properties,
+                    track=track,
+                    profile=profile,
+                    keep=keep,
+                )
+            )
+            yield from outputs
+            return
+        self._reuse_recipes(forge)
+        evaluated = []
+        evaluate = partial(
+            self.evaluate,
+            forge=forge,
+            timeout=timeout,
+            properties=properties,
+            track=track,
+        )
+        names = member_names(self.obj)
+        if deadline is not None:
+            names = cheapest_first(self.obj, names, self._type_key, self.history)
+            evaluate = partial(self._evaluate_before, monotonic() + deadline, evaluate)
+        try:
+            # worker processes are sent the peeper once rather than with each
+            # member
+            opened = open_executor(executor, workers, shared=evaluate)
+            with opened as pool, _tracing_if(profile):
+                for output in pool.map(worker_task(pool, evaluate), names):
+                    if output.evaluated and "total" in output.timings:
+                        cost_model.observe(
+                            self._type_key,
+                            output.name,
+                            output.timings["total"],
+                            output.timed_out,
+                        )
+                    elif output.value == overdue_message:
+                        self.overdue.append(output.name)
+                    if keep:
+                        self._index(output)
+                    if self.store is not None:
+                        evaluated.append(output)
+                    yield output
+        finally:
+            self._remember(evaluated)
+
+    async def apeep(
+        self,
+        forge=False,
+        timeout=None,
+        properties=False,
+        track=False,
+        profile=False,
+        keep=True,
+    ):
+        """ Evaluate each member, then await the coroutines and other
+        awaitables returned by methods and properties concurrently with
+        `asyncio.gather`, on the running event loop
+
+        `timeout` applies to each call and to each awaitable separately.
+        Members that aren't awaitable are evaluated in the loop's thread
+        before anything is awaited, so they block the loop while they run.
+        Returns the list of outputs, which are also kept in the peeper unless
+        `keep` is False. State changes from `track` are recorded, and peak
+        allocations from `profile` are measured, before any awaitable is
+        awaited.
+        """
+        import asyncio
+
+        if self.isolation == "fork":
+            raise ValueError("awaitables can't be awaited with fork isolation")
+        self._reuse_recipes(forge)
+        with _tracing_if(profile):
+            outputs = [
+                self.evaluate(
+                    name,
+                    forge=forge,
+                    timeout=timeout,
+                    properties=properties,
+                    track=track,
+                    awaitables=True,
+                )
+                for name in member_names(self.obj)
+            ]
+        pending = [output for output in outputs if _is_pending(output)]
+        await asyncio.gather(*(_await_output(output, timeout) for output in pending))
+        if keep:
+            for output in outputs:
+                self._index(output)
+        self._remember(outputs)
+        return outputs
+
+    def _reuse_recipes(self, forge):
+        """ Give the forger the arguments found for this type before """
+        if not (forge and self.history):
+            return
+        from peepdis.forging import Forger, forger
+
+        forger = forge if isinstance(forge, Forger) else forger
+        for name, record in self.history.items():
+            key = ((self._type_key, name), tuple(record.args or ()))
+            if record.args and key not in forger.recipes:
+                forger.recipes.put(key, record.args)
+
+    def _remember(self, outputs):
+        """ Save what `outputs` showed about their members to the store """
+        if self.store is None:
+            return
+        from peepdis.store import record_output
+
+        records = {
+            output.name: record_output(output, self.history.get(output.name))
+            for output in outputs
+            if output.evaluated
+        }
+        self.history.update(records)
+        self.store.record(self._type_key, self._version, records)
+
+    @property
+    def profile(self) -> Profile:
+        """ Time and memory spent on each member evaluated so far """
+        return Profile(
+            MemberProfile(name, output.timings) for name, output in self.items()
+        )
 
     def results(self, verbose=False):
         if verbose:
@@ -49,26 +347,173 @@ class Peeper(PeeperMixin, _PreferencesMixin):
         else:
             return {name: self[name] for name in self if name not in self.builtins}
 
-    def print(self, verbose=False):
-        for name, output in self.results(verbose).items():
-            print(*output.get_colored())
+    def print(self, verbose=False, forge=False, **kwargs):
+        """ Print the results, peeping first if that hasn't been done yet
 
-    def evaluate(self, name, *args, forge=False, **kwargs) -> Output:
-        attr = getattr(self.obj, name)
-        if not callable(attr):
-            return Output(name, attr)
-        # TODO: consider different paths for builtins
-        unique_callables = (FunctionType, MethodType)
-        builtin_callables = (BuiltinFunctionType, BuiltinMethodType)
-        if isinstance(attr, unique_callables):
-            peeper_class = CallablePeeper
+        When peeping here, each line is printed as soon as its member has been
+        evaluated rather than after the whole object is done. Options for
+        peeping are passed on to `iter_peep`.
+        """
+        if self:
+            # already evaluated, so build the whole thing and write it once
+            buffer, outputs = LineBuffer(), self.values()
         else:
-            peeper_class = BuiltinCallablePeeper
+            buffer = LineBuffer(sys.stdout)
+            outputs = self.iter_peep(forge, **kwargs)
+        for output in outputs:
+            if verbose or not output.builtin:
+                buffer.add(output.render())
+        if self.overdue:
+            buffer.add(
+                colorize_as(
+                    f"deadline passed before {len(self.overdue)} members were "
+                    f"evaluated: {', '.join(self.overdue)}",
+                    "timeout",
+                )
+            )
+        buffer.write(sys.stdout)
+
+    def evaluate(
+        self,
+        name,
+        *args,
+        forge=False,
+        timeout=None,
+        properties=False,
+        track=False,
+        awaitables=False,
+        **kwargs,
+    ) -> Output:
+        if self.isolation == "fork":
+            # the child exits as soon as it returns, which also ends any
+            # evaluation that was left running past its timeout
+            return call_in_fork(
+                self._evaluate_rendered,
+                name,
+                *args,
+                forge=forge,
+                timeout=timeout,
+                properties=properties,
+                track=track,
+                **kwargs,
+            )
+        return self._evaluate(
+            name,
+            *args,
+            forge=forge,
+            timeout=timeout,
+            properties=properties,
+            track=track,
+            awaitables=awaitables,
+            **kwargs,
+        )
+
+    def _evaluate_before(self, stop_at, evaluate, name) -> Output:
+        """ `evaluate(name)`, with its timeout cut to the time left before the
+        `monotonic` time `stop_at`, or an unevaluated `Output` if none is left
+        """
+        remaining = stop_at - monotonic()
+        if remaining <= 0:
+            return Output(
+                name,
+                overdue_message,
+                callable_=classify(self.obj, name) in ("method", "builtin"),
+                evaluated=False,
+            )
+        timeout = evaluate.keywords.get("timeout")
+        timeout = remaining if timeout is None else min(timeout, remaining)
+        return evaluate(name, timeout=timeout)
+
+    def _evaluate_rendered(self, name, *args, **kwargs) -> Output:
+        output = self._evaluate(name, *args, **kwargs)
+        output.value = str(output.value)
+        return output
+
+    def _evaluate(self, name, *args, awaitables=False, **kwargs) -> Output:
+        record = self.history.get(name)
+        if record is not None and not args and self.store.failed_recently(record):
+            return Output(
+                name,
+                f"(skipped, failed before: {record.error})",
+                callable_=classify(self.obj, name) in ("method", "builtin"),
+                evaluated=False,
+            )
+        timings = {}
+        with measure(timings):
+            output = self._evaluate_member(name, *args, **kwargs)
+        output.timings.update(timings)
+        if _is_pending(output) and not awaitables:
+            # close it rather than let it be garbage collected unawaited
+            getattr(output.value, "close", lambda: None)()
+            output.value = "(awaitable, not awaited)"
+            output.evaluated = False
+        return output
+
+    def _evaluate_member(
+        self,
+        name,
+        *args,
+        forge=False,
+        timeout=None,
+        properties=False,
+        track=False,
+        **kwargs,
+    ) -> Output:
+        kind = classify(self.obj, name)
+        is_property = kind == "property"
+        if is_property and not properties:
+            return Output(
+                name, "(property, not evaluated)", property_=True, evaluated=False
+            )
+        try:
+            attr = call_with_timeout(getattr, self.obj, name, timeout=timeout)
+        except EvaluationTimeout as e:
+            return Output(
+                name,
+                f"(timed out after {e.timeout:.3g}s)",
+                property_=is_property,
+                timed_out=True,
+            )
+        except Exception as e:
+            return Output(name, repr(e), property_=is_property, error=True)
+        if is_property:
+            kind = kind_of(attr)
+        if kind == "attr":
+            return Output(name, attr, property_=is_property)
+        if not (args or kwargs or forge):
+            # skip copying and calling members that can't be called as is
+            sig = get_signature(self.obj, name, attr)
+            required = required_args(sig) if sig is not None else ()
+            if required:
+                missing_arg_str = ", ".join(repr(arg) for arg in required)
+                return Output(
+                    name,
+                    f"(missing args: {missing_arg_str})",
+                    ArgDict.from_signature(sig),
+                    callable_=True,
+                    error=True,
+                    args_missing=True,
+                )
+        # TODO: consider different paths for builtins
         if name == "plot":
             a = 5
         try:
-            peeper = peeper_class(attr)
-            return peeper.evaluate(*args, forge=forge, **kwargs)
+            if kind == "method":
+                signature = get_signature(self.obj, name, attr)
+                if signature is None:
+                    raise TypeError("unsupported callable")
+                peeper = CallablePeeper(
+                    attr, isolation=self.isolation, signature=signature
+                )
+            else:
+                peeper = BuiltinCallablePeeper(
+                    attr, isolation=self.isolation, name=name
+                )
+            output = peeper.evaluate(
+                *args, forge=forge, timeout=timeout, track=track, **kwargs
+            )
+            output.timings.update(peeper.timer.timings)
+            return output
         except Exception as e:
             if "unsupported callable" in str(e):
                 output_str = "(unsupported callable)"
@@ -78,34 +523,66 @@ class Peeper(PeeperMixin, _PreferencesMixin):
             else:
                 raise ValueError(f"Unexpected error for method {name}")
 
+    def _unindex(self, name):
+        self.pop(name, None)
+        for category in (
+            self.attrs,
+            self.methods,
+            self.errors,
+            self.builtins,
+            self.unevaluated,
+        ):
+            category.discard(name)
+
     def _index(self, output: Output):
+        if not self.keep_values:
+            output.release()
+        if output.name in self:
+            self._unindex(output.name)
         self[output.name] = output
-        if output.builtin:
-            self.builtins[output.name] = self[output.name].value
+        if not output.evaluated:
+            self.unevaluated.add(output.name)
+        elif output.builtin:
+            self.builtins.add(output.name)
         elif output.callable_:
-            self.methods[output.name] = self[output.name].value
+            self.methods.add(output.name)
         elif output.error:
-            self.errors[output.name] = self[output.name].value
+            self.errors.add(output.name)
         else:
-            self.attrs[output.name] = self[output.name].value
+            self.attrs.add(output.name)
 
 
 class BuiltinCallablePeeper(PeeperMixin):
     # TODO: will need to merge with CallablePeeper in the future
-    def __init__(self, obj, *args, **kwargs):
-        super().__init__(obj)
+    def __init__(self, obj, *args, isolation="deepcopy", name=None, **kwargs):
+        super().__init__(obj, isolation=isolation)
+        # callable instances, like `functools.partial`, don't have a `__name__`
+        self.name = name if name is not None else getattr(obj, "__name__", None)
+        if self.name is None:
+            self.name = type(obj).__name__
         # TODO: move ArgDict instantiation up here and fix numbering
 
-    def evaluate(self, *args, forge=False, **kwargs) -> Output:
-        # TODO: figure out how to set up args in this case (no access to positional arg names)
-        arg_names = [i for i in range(len(args))]
-        arg_names += list(kwargs.values())
-        self.args = ArgDict(arg_names)
-        self.args.update_positional(*args)
-        self.args.update_kwargs(**kwargs)
-        obj = deepcopy(self.obj)
+    def evaluate(
+        self, *args, forge=False, timeout=None, track=False, **kwargs
+    ) -> Output:
+        self.args = _builtin_args(self.obj, *args, **kwargs)
+        obj = self.obj
+        if self.isolation == "deepcopy":
+            with self.timer.phase("copy"):
+                obj = _copy_builtin_method(obj)
+        before = self._snapshot(obj) if track else None
         try:
-            output_str = repr(obj(*args, **kwargs))
+            output_str = call_with_timeout(
+                self._call_and_render, obj, *args, timeout=timeout, **kwargs
+            )
+        except EvaluationTimeout as e:
+            return Output(
+                self.name,
+                f"(timed out after {e.timeout:.3g}s)",
+                self.args,
+                callable_=True,
+                timed_out=True,
+            )
         except Exception as e:
             output_str = repr(e)
             error = True
@@ -123,50 +600,117 @@ class BuiltinCallablePeeper(PeeperMixin):
             error = False
             args_missing = False
         return Output(
-            obj.__name__,
+            self.name,
             output_str,
             self.args,
             callable_=True,
             error=error,
             args_missing=args_missing,
+            state_change=self._state_change(before, obj),
         )
 
 
+def _is_pending(output: Output):
+    """ Whether `output` holds an awaitable returned by a method or property """
+    return (output.callable_ or output.property_) and isawaitable(output.value)
+
+
+async def _await_output(output: Output, timeout=None):
+    import asyncio
+
+    start = perf_counter()
+    try:
+        result = await asyncio.wait_for(output.value, timeout)
+    except asyncio.TimeoutError:
+        output.value = f"(timed out after {timeout:.3g}s)"
+        output.timed_out = True
+    except Exception as e:
+        output.value = repr(e)
+        output.error = True
+    else:
+        # like other members, only the results of calls are rendered
+        output.value = repr(result) if output.callable_ else result
+    finally:
+        elapsed = perf_counter() - start
+        output.timings["call"] = output.timings.get("call", 0.0) + elapsed
+        output.timings["total"] = output.timings.get("total", 0.0) + elapsed
+
+
+def _tracing_if(profile):
+    return tracing() if profile else nullcontext()
+
+
+def _builtin_args(func, *args, **kwargs) -> ArgDict:
+    """ The arguments of a call to the C builtin `func`, named after its
+    parameters if it has a text signature, otherwise by position
+    """
+    try:
+        return ArgDict.from_signature(inspect.signature(func)).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        parameters = [
+            Parameter(f"arg{i}", Parameter.POSITIONAL_ONLY) for i in range(len(args))
+        ]
+        parameters += [Parameter(name, Parameter.KEYWORD_ONLY) for name in kwargs]
+        args_ = ArgDict.from_signature(inspect.Signature(parameters))
+        return args_.bind(*args, **kwargs)
+
+
+def _copy_builtin_method(method):
+    # `deepcopy` treats builtin methods as atomic, which would leave them bound
+    # to the original object, so copy the object and bind the method again
+    owner = getattr(method, "__self__", None)
+    if isinstance(method, BuiltinMethodType) and not isinstance(
+        owner, (ModuleType, type(None))
+    ):
+        return getattr(deepcopy(owner), method.__name__)
+    return deepcopy(method)
+
+
 class CallablePeeper(PeeperMixin):
     _ordinary_callables = (FunctionType, MethodType)
     _builtin_callables = (BuiltinFunctionType, BuiltinMethodType)
-    _forgery_dict = {"int": 0, "str": "abc", "list": [0, 1], "None": None}
 
-    def __init__(self, obj, *args, **kwargs):
-        super().__init__(obj)
+    def __init__(self, obj, *args, isolation="deepcopy", signature=None, **kwargs):
+        super().__init__(obj, isolation=isolation)
         if isinstance(obj, self._ordinary_callables):
-            self.spec = getfullargspec(obj)    # TODO: test on arrays, dataframes, and sklearn models (seemed to work on sklearn)
-            self.args = ArgDict(self.spec.args)
-            self._collect_args(*args, **kwargs)
+            # TODO: test on arrays, dataframes, and sklearn models (seemed to work on sklearn)
+            if signature is None:
+                try:
+                    signature = inspect.signature(obj)
+                except (TypeError, ValueError):
+                    raise TypeError("unsupported callable")
+            self.signature = signature
+            self.args = ArgDict.from_signature(signature)
+            self.args.bind(*args, **kwargs)
         elif isinstance(obj, self._builtin_callables):
             self.args = ArgDict([])
 
-    def _collect_args(self, *args, **kwargs):
-        if self.spec.defaults:
-            for i, arg in enumerate(self.spec.defaults[::-1]):
-                self.args[-1 - i].value = arg
-                self.args[-1 - i].method = "default"
-        for i, arg in enumerate(args):
-            self.args[i].value = arg
-            self.args[i].method = "specified"
-        for name, arg in kwargs.items():
-            self.args[name].value = arg
-            self.args[name].method = "specified"
-
-    def evaluate(self, *args, forge=False, **kwargs) -> Output:
-        obj = deepcopy(self.obj)
+    def evaluate(
+        self, *args, forge=False, timeout=None, track=False, **kwargs
+    ) -> Output:
+        obj = self.obj
+        if self.isolation == "deepcopy":
+            with self.timer.phase("copy"):
+                obj = deepcopy(obj)
+        before = self._snapshot(obj) if track else None
         if forge:
-            self.forge_args()
-        self.args.update_positional(*args)
-        self.args.update_kwargs(**kwargs)
-        arg_dict = self.args.generate_args()
+            forger = forge if isinstance(forge, forging.Forger) else None
+            with self.timer.phase("forge"):
+                self.forge_args(forger=forger, timeout=timeout)
+        self.args.bind(*args, **kwargs)
+        call_args, call_kwargs = self.args.call_arguments()
         try:
-            output_str = repr(obj(**arg_dict))
+            output_str = call_with_timeout(
+                self._call_and_render, obj, *call_args, timeout=timeout, **call_kwargs
+            )
+        except EvaluationTimeout as e:
+            return Output(
+                obj.__name__,
+                f"(timed out after {e.timeout:.3g}s)",
+                self.args,
+                callable_=True,
+                timed_out=True,
+            )
         except Exception as e:
             output_str = repr(e)
             error = True
@@ -187,39 +731,33 @@ class CallablePeeper(PeeperMixin):
             callable_=True,
             error=error,
             args_missing=args_missing,
+            state_change=self._state_change(before, obj),
         )
 
-    def forge_args(self, *args, **kwargs):
-        """ Attempt to generate arguments to call the method """
-        # TODO: currently forging kwargs and causing errors. Only forge positionals
+    def forge_args(self, *args, forger=None, timeout=None, **kwargs):
+        """ Fill in the missing positional arguments with values the method
+        can be called with, found by `forger`
+        """
+        forger = forger if forger is not None else forging.forger
         type_dict = self._infer_types()
-        self.args.returns = type_dict.pop("returns", None)
-        for name in self.args.null_args:
-            type_ = type_dict.get(name, None)
-            if not type_:
-                # TODO: fill in with brute force
-                continue
-            self.args[name].value = self._forgery_dict[type_]
-            self.args[name].method = "forged"
+        for name, type_ in type_dict.items():
             self.args[name].type_ = type_
-        for i, arg in enumerate(args):
-            self.args[i].value = arg
-            self.args[i].method = "specified"
-        for name, arg in kwargs.items():
-            self.args[name].value = arg
-            self.args[name].method = "specified"
+        self.args.bind(*args, **kwargs)
+        missing = self.args.missing_positional
+        try:
+            values = forger.forge(self.obj, missing, timeout=timeout, bound=self.args)
+        except forging.ForgeError:
+            values = {}
+        for name, value in values.items():
+            self.args[name].value = value
+            self.args[name].method = "forged"
         return self.args
 
-    def _infer_types(self, brute_force=True):
-        """ Infer the argument types from the type annotations """
-        # TODO: modify state of self.args rather than calling in forge_args
-        type_dict = dict(self.spec.annotations)
-        type_dict = {k: v.__name__ for k, v in type_dict}
-        type_dict.pop("self", None)
-        return type_dict
-
-    def _brute_force_types(self):
-        # TODO: iterate through missing arguments, trying different things
-        # make a new class to do this?
-        pass
+    def _infer_types(self):
+        """ Infer the argument types from the type annotations, and keep the
+        return type as `args.returns`
+        """
+        type_dict = forging.infer_types(self.obj)
+        self.args.returns = type_dict.get("return")
+        return {name: type_dict[name] for name in self.args if name in type_dict}
 
@@ -1,66 +1,252 @@
 from collections import OrderedDict
-from termcolor import colored
+from collections.abc import Mapping
+from functools import lru_cache
+from inspect import Parameter, Signature
+import sys
 from typing import Any, Callable, Dict, List, Tuple, Type, Union
 
 from peepdis.preferences import _PreferencesMixin
+from peepdis.rendering import bounded_repr, colorize, shorten
+from peepdis.summaries import summarize
+from peepdis.tracking import StateChange
+
+# characters of each value kept by `Output.release`
+max_value_len = 1000
+# values of these types are kept as they are by `release` if they're small
+_scalar_types = (type(None), bool, int, float, complex)
+
+
+def _bounded(value, max_len):
+    """ `value` if it's small, otherwise its rendering as shown by
+    `Output.get_colored`, truncated after `max_len` characters, and whether it
+    was rendered
+    """
+    if isinstance(value, str):
+        return shorten(value, max_len=max_len), False
+    if type(value) in _scalar_types and sys.getsizeof(value) <= 128:
+        return value, False
+    summary = summarize(value)
+    if summary is not None:
+        return shorten(summary, max_len=max_len), True
+    try:
+        rendered = str(value)
+    except Exception:
+        # like `reprlib`, which names the type of values that fail to render
+        return bounded_repr(value, max_len), True
+    return shorten(rendered, max_len=max_len), True
 
 
 class Arg(_PreferencesMixin):
-    def __init__(self, name, value: Any = None, type_: Type = None, method: str = None):
+    __slots__ = ("name", "value", "type_", "method", "kind", "released")
+
+    def __init__(
+        self,
+        name,
+        value: Any = None,
+        type_: Type = None,
+        method: str = None,
+        kind=Parameter.POSITIONAL_OR_KEYWORD,
+    ):
         self.name = name
         self.value = value
         self.type_ = type_
         self.method = method
+        self.kind = kind
+        self.released = False
+
+    def release(self, max_len=max_value_len):
+        """ Replace a large value with its bounded rendering """
+        if not self.released:
+            self.value, self.released = _bounded(self.value, max_len)
 
     def get_colored(self):
-        return colored(str(self), self._color_scheme[str(self.method)])
+        return colorize(str(self), self._color_scheme[str(self.method)])
+
+    @property
+    def bound(self):
+        """ Whether a value was given or forged, rather than left unset or to
+        its default
+        """
+        return self.method not in (None, "default")
 
     def __str__(self):
         annotation_str = "="
         if self._display_type_annotations:
-            annotation_str = f": {self.type_} = "
-        str_ = self.name + annotation_str + str(self.value)
+            type_ = self.type_
+            type_str = type_.__name__ if isinstance(type_, type) else str(type_)
+            annotation_str = f": {type_str} = "
+        prefix = _prefixes.get(self.kind, "")
+        str_ = prefix + self.name + annotation_str + str(self.value)
         return str_
 
     def __eq__(self, other):
         return self.value == other
 
 
+_positional_kinds = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+_prefixes = {Parameter.VAR_POSITIONAL: "*", Parameter.VAR_KEYWORD: "**"}
+
+
 class ArgDict(OrderedDict, _PreferencesMixin):
-    def __init__(self, names: Union[Dict, List, Tuple]):
+    """ The arguments of a call by parameter name, in signature order
+
+    Each `Arg` knows its parameter's kind. Positional parameters are also
+    kept in a list, so they're indexed by position in constant time, and
+    `bind` fills in the values of a call in one pass, as the call would.
+    `*args` and `**kwargs` are kept aside, and only shown once they're bound.
+    """
+
+    __slots__ = ("returns", "_positional", "_positions", "_varargs", "_varkw")
+
+    def __init__(self, names: Union[List, Tuple] = ()):
         super().__init__()
-        if "self" in names:
-            names.remove("self")
-        if "return" in names:
-            names.remove("return")
-        if isinstance(names, dict):
-            for name, arg in names:
-                self[name] = Arg(name, arg)
-        else:
-            for name in names:
-                self[name] = Arg(name)
         self.returns = None
+        self._positional = []
+        self._positions = {}
+        self._varargs = None
+        self._varkw = None
+        for name in names:
+            if name not in ("self", "return"):
+                self._add(Arg(name))
+
+    @classmethod
+    def from_signature(cls, sig: Signature):
+        """ An `ArgDict` of the parameters of `sig`, with their defaults and
+        annotations
+        """
+        args = cls()
+        for name, param in sig.parameters.items():
+            arg = Arg(name, kind=param.kind)
+            if param.default is not Parameter.empty:
+                arg.value, arg.method = param.default, "default"
+            if param.annotation is not Parameter.empty:
+                arg.type_ = param.annotation
+            args._add(arg)
+        return args
+
+    def _add(self, arg: Arg):
+        if arg.kind in _positional_kinds:
+            self._positions[arg.name] = len(self._positional)
+            self._positional.append(arg)
+        elif arg.kind is Parameter.VAR_POSITIONAL:
+            self._varargs = arg
+            return
+        elif arg.kind is Parameter.VAR_KEYWORD:
+            self._varkw = arg
+            return
+        super().__setitem__(arg.name, arg)
 
     def get_colored(self):
-        return [arg.get_colored() for arg in self.values()]
+        return [arg.get_colored() for arg in self._shown()]
+
+    def to_dict(self, max_len=250):
+        return {
+            arg.name: {
+                "value": (
+                    shorten(arg.value, max_len=max_len)
+                    if arg.released
+                    else bounded_repr(arg.value, max_len)
+                ),
+                "type": None if arg.type_ is None else str(arg.type_),
+                "method": arg.method,
+            }
+            for arg in self._shown()
+        }
+
+    def _shown(self):
+        """ The args in signature order, with `*args` and `**kwargs` if they
+        were bound
+        """
+        yield from self._positional
+        if self._varargs is not None and self._varargs.bound:
+            yield self._varargs
+        for arg in self.values():
+            if arg.kind is Parameter.KEYWORD_ONLY:
+                yield arg
+        if self._varkw is not None and self._varkw.bound:
+            yield self._varkw
+
+    def bind(self, *args, method="specified", **kwargs):
+        """ Set the values that `args` and `kwargs` would be passed as, raising
+        `TypeError` if they don't fit the parameters
+        """
+        n_positional = len(self._positional)
+        for arg, value in zip(self._positional, args):
+            arg.value, arg.method = value, method
+        if len(args) > n_positional:
+            if self._varargs is None:
+                raise TypeError(
+                    f"takes {n_positional} positional arguments but {len(args)} "
+                    "were given"
+                )
+            self._varargs.value = tuple(args[n_positional:])
+            self._varargs.method = method
+        extra = {}
+        for name, value in kwargs.items():
+            arg = self.get(name)
+            if arg is None or arg.kind is Parameter.POSITIONAL_ONLY:
+                extra[name] = value
+            else:
+                arg.value, arg.method = value, method
+        if extra:
+            if self._varkw is None:
+                name = next(iter(extra))
+                raise TypeError(f"got an unexpected keyword argument {name!r}")
+            self._varkw.value, self._varkw.method = extra, method
+        return self
 
     def update_positional(self, *args):
-        for i, arg in enumerate(args):
-            self[i].value = arg
-            self[i].method = "specified"
+        self.bind(*args)
 
     def update_kwargs(self, **kwargs):
-        for name, arg in kwargs:
-            self[name].value = arg
-            self[name].method = "specified"
+        self.bind(**kwargs)
+
+    def call_arguments(self, overrides=None) -> Tuple[tuple, dict]:
+        """ The `(args, kwargs)` to make the call with, with the values in
+        `overrides` in place of those of the same parameters
+
+        Bound values are passed by position up to the first positional
+        parameter that's left to its default or unset, and by keyword after
+        that.
+        """
+        overrides = overrides or {}
+        args, kwargs = [], {}
+        by_keyword = False
+        for arg in self._positional:
+            if arg.name in overrides:
+                value = overrides[arg.name]
+            elif arg.bound:
+                value = arg.value
+            else:
+                by_keyword = True
+                continue
+            if not by_keyword:
+                args.append(value)
+            elif arg.kind is not Parameter.POSITIONAL_ONLY:
+                kwargs[arg.name] = value
+        if self._varargs is not None and self._varargs.bound and not by_keyword:
+            args.extend(self._varargs.value)
+        for arg in self.values():
+            if arg.kind is Parameter.KEYWORD_ONLY and (
+                arg.bound or arg.name in overrides
+            ):
+                kwargs[arg.name] = overrides.get(arg.name, arg.value)
+        if self._varkw is not None and self._varkw.bound:
+            kwargs.update(self._varkw.value)
+        return tuple(args), kwargs
 
     def generate_args(self):
         return {name: arg.value for name, arg in self.items()}
 
+    @property
+    def missing_positional(self):
+        """ Names of the positional parameters without a value or default """
+        return tuple(arg.name for arg in self._positional if arg.method is None)
+
     @property
     def null_args(self):
-        nulls = tuple([k for k, v in self.items() if v.value is None])
-        return nulls
+        """ Names of the parameters without a value or default """
+        return tuple(name for name, arg in self.items() if arg.method is None)
 
     @property
     def is_full(self):
@@ -71,21 +257,47 @@ class ArgDict(OrderedDict, _PreferencesMixin):
 
     def __getitem__(self, key):
         if isinstance(key, int):
-            key = list(self.keys())[key]
+            return self._positional[key]
         return super().__getitem__(key)
 
     def __setitem__(self, key, value):
         if not isinstance(value, Arg):
             raise TypeError(f"`ArgDict` values must be type `Arg`, not: {type(value)}")
         if isinstance(key, int):
-            key = list(self.keys())[key]
+            key = self._positional[key].name
+        position = self._positions.get(key)
+        if position is not None:
+            self._positional[position] = value
         super().__setitem__(key, value)
 
 
 class Output(_PreferencesMixin):
-    _types = {float, int, list, dict, str, tuple}
-    _magics = {"__dict__", "__module__", "__weakref__", "__slotnames__"}
-    _builtins = {x for type_ in _types for x in dir(type_)} | _magics
+    """ The result of evaluating one member
+
+    `value` is the member's value, or the rendered result of calling it. A
+    large value keeps everything it references alive for as long as the
+    output is kept, so `Peeper` replaces it with its bounded rendering with
+    `release`, unless it's asked to keep values.
+    """
+
+    __slots__ = (
+        "name",
+        "value",
+        "_args",
+        "callable_",
+        "error",
+        "args_missing",
+        "unsupported_callable",
+        "timed_out",
+        "property_",
+        "evaluated",
+        "timings",
+        "state_change",
+        "builtin",
+        "released",
+    )
+    _types = (float, int, list, dict, str, tuple)
+    _magics = frozenset(("__dict__", "__module__", "__weakref__", "__slotnames__"))
 
     def __init__(
         self,
@@ -96,32 +308,102 @@ class Output(_PreferencesMixin):
         error: bool = False,
         args_missing: bool = False,
         unsupported_callable: bool = False,
+        timed_out: bool = False,
+        property_: bool = False,
+        evaluated: bool = True,
+        timings: Dict[str, float] = None,
+        state_change: StateChange = None,
     ):
         self.name = name
         self.value = value
-        self.args = args if args else ArgDict([])
+        # most outputs are of attributes, so an empty `ArgDict` is only made
+        # when it's asked for
+        self._args = args if args else None
         self.callable_ = callable_
         self.error = error
         self.args_missing = args_missing
         self.unsupported_callable = unsupported_callable
-        self.builtin = True if name in self._builtins else False
+        self.timed_out = timed_out
+        self.property_ = property_
+        self.evaluated = evaluated
+        self.timings = timings if timings else {}
+        self.state_change = state_change
+        self.builtin = name in _builtin_names()
+        self.released = False
+
+    @property
+    def args(self) -> ArgDict:
+        if self._args is None:
+            self._args = ArgDict([])
+        return self._args
+
+    @args.setter
+    def args(self, args: ArgDict):
+        self._args = args
+
+    def release(self, max_len=max_value_len):
+        """ Replace the value, and the values of the arguments, with their
+        renderings truncated after `max_len` characters, if they're large
+        """
+        if not self.released:
+            self.value, self.released = _bounded(self.value, max_len)
+        if self._args:
+            for arg in self._args.values():
+                arg.release(max_len)
 
     def print(self):
-        print(*self.get_colored())
+        print(self.render())
+
+    def to_dict(self, max_len=250):
+        """ Plain, JSON serializable version of the output, with the value
+        rendered and truncated to `max_len` characters
+        """
+        rendered = (
+            self.released
+            or self.callable_
+            or self.error
+            or self.timed_out
+            or not self.evaluated
+        )
+        if isinstance(self.value, str) and rendered:
+            # already rendered by the evaluation
+            value = shorten(self.value, max_len=max_len)
+        else:
+            value = bounded_repr(self.value, max_len)
+        return {
+            "name": self.name,
+            "kind": self.obj_type,
+            "args": self._args.to_dict(max_len) if self._args else {},
+            "output_type": self.output_type,
+            "value": value,
+            "error": self.error,
+            "timed_out": self.timed_out,
+            "evaluated": self.evaluated,
+            "timings": dict(self.timings),
+            "state_change": self.state_change.to_dict() if self.state_change else None,
+        }
+
+    def render(self):
+        return " ".join(self.get_colored())
 
     def get_colored(self):
         # color name and arguments
         base_color = self._color_scheme[self.obj_type]
-        base = colored(self.name, base_color)
+        base = colorize(self.name, base_color)
         if self.callable_:
-            open_parenthesis = colored("(", base_color)
-            close_parenthesis = colored(")", base_color)
-            args = colored(", ", base_color).join(self.args.get_colored())
+            open_parenthesis = colorize("(", base_color)
+            close_parenthesis = colorize(")", base_color)
+            args = colorize(", ", base_color).join(self.args.get_colored())
             base += open_parenthesis + args + close_parenthesis
-        colon = colored(":", base_color)
+        colon = colorize(":", base_color)
         base += colon
         # color output message
-        msg = colored(self.value, self._color_scheme[self.output_type])
+        summary = summarize(self.value)
+        value = self.value if summary is None else summary
+        msg = colorize(value, self._color_scheme[self.output_type])
+        if self.state_change:
+            change = f"[changed {self.state_change.render()}]"
+            msg += " " + colorize(change, self._color_scheme["state_change"])
         return base, msg
 
     @property
@@ -130,12 +412,18 @@ class Output(_PreferencesMixin):
             return "builtin"
         if self.callable_:
             return "callable_"
+        elif self.property_:
+            return "property"
         else:
             return "attr"
 
     @property
     def output_type(self):
-        if self.unsupported_callable:
+        if not self.evaluated:
+            return "null"
+        elif self.timed_out:
+            return "timeout"
+        elif self.unsupported_callable:
             return "null"
         elif self.args_missing:
             return "null"
@@ -145,3 +433,48 @@ class Output(_PreferencesMixin):
             return "builtin"
         else:
             return "message"
+
+
+class OutputIndex(Mapping):
+    """ The values of the outputs of one category, by name
+
+    Only the names are kept here; values are looked up in `outputs`, the
+    mapping of every `Output` by name, so each output is only stored once.
+    """
+
+    __slots__ = ("_outputs", "_names")
+
+    def __init__(self, outputs):
+        self._outputs = outputs
+        self._names = {}
+
+    def add(self, name):
+        self._names[name] = None
+
+    def discard(self, name):
+        self._names.pop(name, None)
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        return self._outputs[name].value
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+@lru_cache(maxsize=None)
+def _builtin_names():
+    """ Members of builtin types, which are counted as builtins wherever they
+    turn up, built on first use rather than at import
+    """
+    return frozenset(x for type_ in Output._types for x in dir(type_)) | Output._magics
@@ -0,0 +1,230 @@
+import concurrent.futures
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+import os
+import pickle
+import sys
+from threading import Thread
+import weakref
+
+
+class EvaluationTimeout(Exception):
+    """ Raised when evaluating a member exceeds its time budget """
+
+    def __init__(self, timeout):
+        super().__init__(f"evaluation exceeded {timeout}s")
+        self.timeout = timeout
+
+
+def call_with_timeout(func, *args, timeout=None, **kwargs):
+    """ Call `func` with a wall-clock budget of `timeout` seconds
+
+    The call runs in a daemon thread so that the caller can move on once the
+    budget is spent. Python threads can't be killed, so a timed out call keeps
+    running in the background until it returns on its own.
+    """
+    if timeout is None:
+        return func(*args, **kwargs)
+    result = {}
+
+    def target():
+        try:
+            result["value"] = func(*args, **kwargs)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise EvaluationTimeout(timeout)
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def run_coroutine(coro):
+    """ Run `coro` to completion on a private event loop and return its result
+
+    If the calling thread is already running an event loop, the private one is
+    run in another thread, since a thread can only run one loop at a time.
+    """
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    result = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def call_in_fork(func, *args, **kwargs):
+    """ Call `func` in a forked child process and return its result
+
+    The child shares the parent's memory copy-on-write, so `func` may mutate
+    whatever it touches without a copy being made up front, and without the
+    parent seeing it. Only the pickled result is sent back.
+    """
+    read_fd, write_fd = os.pipe()
+    # flush first so that the child doesn't inherit and repeat buffered output
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        status = 0
+        try:
+            try:
+                payload = pickle.dumps((True, func(*args, **kwargs)))
+            except BaseException as e:
+                payload = pickle.dumps((False, _picklable_error(e)))
+            with os.fdopen(write_fd, "wb") as pipe:
+                pipe.write(payload)
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        payload = pipe.read()
+    os.waitpid(pid, 0)
+    if not payload:
+        raise ChildProcessError("forked evaluation exited without a result")
+    succeeded, value = pickle.loads(payload)
+    if succeeded:
+        return value
+    raise value
+
+
+def _picklable_error(e):
+    try:
+        return pickle.loads(pickle.dumps(e))
+    except Exception:
+        return RuntimeError(f"{type(e).__name__}: {e}")
+
+
+_isolations = ("deepcopy", "fork")
+
+
+def check_isolation(isolation):
+    if isolation not in _isolations:
+        raise ValueError(
+            f"`isolation` must be one of {list(_isolations)}, not: {isolation!r}"
+        )
+    if isolation == "fork" and not hasattr(os, "fork"):
+        raise ValueError("`isolation='fork'` is not supported on this platform")
+
+
+class InlineExecutor(Executor):
+    """ Executor that runs each task immediately in the calling thread """
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        # evaluate lazily so results come out as soon as each one is ready
+        return (fn(*args) for args in zip(*iterables))
+
+
+# pools other than inline are looked up from `concurrent.futures` when first
+# used, which is when their modules are imported
+_executors = {
+    "inline": "InlineExecutor",
+    "thread": "ThreadPoolExecutor",
+    "process": "ProcessPoolExecutor",
+}
+
+
+def is_process_pool(pool):
+    """ Whether `pool` runs tasks in other processes """
+    process = sys.modules.get("concurrent.futures.process")
+    return process is not None and isinstance(pool, process.ProcessPoolExecutor)
+
+
+# the function sent to this worker process when it started, see `open_executor`
+_shared = None
+# pools whose workers were each sent a function, to the function
+_shared_by_pool = weakref.WeakKeyDictionary()
+
+
+def _share(func):
+    global _shared
+    _shared = func
+
+
+def call_shared(*args, **kwargs):
+    """ Call the function that was sent to this worker process """
+    return _shared(*args, **kwargs)
+
+
+def worker_task(pool, func):
+    """ The function to map over `pool` to call `func`: `call_shared` if
+    `func` was already sent to its workers, otherwise `func` itself
+    """
+    return call_shared if _shared_by_pool.get(pool) is func else func
+
+
+@contextmanager
+def open_executor(executor="inline", workers=None, shared=None):
+    """ Yield an executor for member evaluation
+
+    `executor` is one of "inline", "thread" or "process", or an existing
+    `concurrent.futures.Executor`, which is left running for the caller to
+    shut down.
+
+    With a new process pool, the function `shared` is sent to each worker
+    once, when it starts, rather than pickled again with every task, along
+    with the object it's bound to. Map `worker_task(pool, shared)` to use it.
+    """
+    if isinstance(executor, Executor):
+        yield executor
+        return
+    try:
+        class_name = _executors[executor]
+    except KeyError:
+        raise ValueError(
+            f"`executor` must be one of {sorted(_executors)}, not: {executor!r}"
+        )
+    if class_name == "InlineExecutor":
+        pool = InlineExecutor()
+    elif class_name == "ProcessPoolExecutor" and shared is not None:
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_share, initargs=(shared,)
+        )
+        _shared_by_pool[pool] = shared
+    else:
+        pool = getattr(concurrent.futures, class_name)(max_workers=workers)
+    stopped_early = False
+    try:
+        yield pool
+    except GeneratorExit:
+        stopped_early = True
+        raise
+    finally:
+        # don't start pending evaluations if the caller stopped consuming early,
+        # but let them finish after an error, since a process pool can hang
+        # cancelling work its feeder thread failed to pickle
+        if stopped_early and sys.version_info >= (3, 9):
+            pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            pool.shutdown(wait=True)
@@ -0,0 +1,69 @@
+""" Writing peep results to files as JSON Lines
+
+Outputs are written as they're produced, so peeping into a file takes the
+same memory however many members there are.
+"""
+import json
+
+from peepdis.core import Peeper
+
+_formats = ("jsonl", "columnar")
+
+
+def write_jsonl(outputs, file, max_len=250):
+    """ Write each `Output` in `outputs` to `file` as a line of JSON, returning
+    how many were written
+    """
+    count = 0
+    for output in outputs:
+        file.write(json.dumps(output.to_dict(max_len), default=str) + "\n")
+        file.flush()
+        count += 1
+    return count
+
+
+def write_columnar(outputs, file, max_len=250, chunk_size=1000):
+    """ Write `outputs` to `file` in chunks of up to `chunk_size`, each a line
+    of JSON mapping every field to the list of its values in the chunk,
+    returning how many were written
+
+    Only one chunk is held in memory at a time.
+    """
+    count = 0
+    columns = {}
+    for output in outputs:
+        for field, value in output.to_dict(max_len).items():
+            columns.setdefault(field, []).append(value)
+        count += 1
+        if count % chunk_size == 0:
+            _write_chunk(columns, file)
+            columns = {}
+    if columns:
+        _write_chunk(columns, file)
+    return count
+
+
+def _write_chunk(columns, file):
+    file.write(json.dumps(columns, default=str) + "\n")
+    file.flush()
+
+
+def read_columnar(file):
+    """ Yield each record written by `write_columnar` as a dict """
+    for line in file:
+        columns = json.loads(line)
+        yield from (dict(zip(columns, values)) for values in zip(*columns.values()))
+
+
+def export(obj, file, format="jsonl", max_len=250, isolation="deepcopy", **kwargs):
+    """ Peep `obj` straight into `file`, as "jsonl" or "columnar"
+
+    Each output is written as soon as it's evaluated and isn't kept
+    afterwards. Other options are passed on to `Peeper.iter_peep`.
+    """
+    if format not in _formats:
+        raise ValueError(f"`format` must be one of {list(_formats)}, not: {format!r}")
+    outputs = Peeper(obj, isolation=isolation).iter_peep(keep=False, **kwargs)
+    if format == "columnar":
+        return write_columnar(outputs, file, max_len)
+    return write_jsonl(outputs, file, max_len)
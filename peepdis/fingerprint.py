@@ -0,0 +1,128 @@
+""" Cheap fingerprints of object state, for telling whether it has changed
+
+Fingerprints are shallow: an object's own attributes are compared by value
+where that's cheap (immutables, numpy buffers, pandas objects), and by
+identity and length otherwise. Changes deep inside nested mutable objects
+aren't detected.
+"""
+import sys
+import zlib
+
+from peepdis.introspection import instance_attributes, registered_for
+
+_immutables = (type(None), bool, int, float, complex, str, bytes, range)
+
+
+def fingerprint(obj):
+    """ Return a hashable fingerprint of the state of `obj`, or `None` if
+    there's no cheap way to take one
+    """
+    fingerprinter = _find_fingerprinter(obj)
+    if fingerprinter is not None:
+        return _fingerprint_with(fingerprinter, obj)
+    if isinstance(obj, _immutables):
+        return (type(obj), obj)
+    state = attribute_fingerprints(obj)
+    if state is not None:
+        return (type(obj), tuple(state.items()))
+    if isinstance(obj, (list, tuple, set, frozenset, dict)):
+        return value_fingerprint(obj)
+    return None
+
+
+def attribute_fingerprints(obj):
+    """ Return a dict of each attribute of `obj` to its fingerprint, or `None`
+    if `obj` has neither a `__dict__` nor `__slots__`, or if any attribute
+    couldn't be fingerprinted
+    """
+    state = instance_attributes(obj)
+    if state is None:
+        return None
+    fingerprints = {}
+    for name, value in state.items():
+        fingerprints[name] = value_fingerprint(value)
+        if fingerprints[name] is None:
+            return None
+    return fingerprints
+
+
+def value_fingerprint(value):
+    """ Fingerprint of a single attribute value, or `None` if it couldn't be
+    taken
+    """
+    fingerprinter = _find_fingerprinter(value)
+    if fingerprinter is not None:
+        return _fingerprint_with(fingerprinter, value)
+    if isinstance(value, _immutables):
+        return (type(value), value)
+    if isinstance(value, (list, tuple)):
+        return (type(value), id(value), tuple(map(_shallow, value)))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), id(value), frozenset(map(_shallow, value)))
+    if isinstance(value, dict):
+        items = tuple((_shallow(k), _shallow(v)) for k, v in value.items())
+        return (type(value), id(value), items)
+    return _shallow(value)
+
+
+def is_exact(value):
+    """ Whether the fingerprint of `value` changes whenever its state does,
+    rather than only when it's replaced: immutables, values with a
+    fingerprinter, and builtin containers of immutables
+    """
+    if isinstance(value, _immutables) or _find_fingerprinter(value) is not None:
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(isinstance(item, _immutables) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, _immutables) and isinstance(item, _immutables)
+            for key, item in value.items()
+        )
+    return False
+
+
+def _shallow(value):
+    if isinstance(value, _immutables):
+        return (type(value), value)
+    return (type(value), id(value))
+
+
+def _fingerprint_with(fingerprinter, value):
+    try:
+        return fingerprinter(value)
+    except Exception:
+        # like object arrays or unhashable cells: treated as not fingerprintable
+        return None
+
+
+def _ndarray_fingerprint(arr):
+    np = sys.modules["numpy"]
+    buffer = np.ascontiguousarray(arr).view(np.uint8)
+    return ("ndarray", arr.shape, arr.dtype.str, zlib.crc32(buffer.data))
+
+
+def _pandas_fingerprint(obj):
+    pd = sys.modules["pandas"]
+    hashes = pd.util.hash_pandas_object(obj, index=True).values
+    return (type(obj).__name__, obj.shape, zlib.crc32(hashes.data))
+
+
+# keyed by the fully qualified name of the type, so that numpy and pandas are
+# only needed if the object being fingerprinted came from them
+_fingerprinters = {
+    "numpy.ndarray": _ndarray_fingerprint,
+    "pandas.DataFrame": _pandas_fingerprint,
+    "pandas.Series": _pandas_fingerprint,
+}
+
+
+def register_fingerprinter(type_name, func):
+    """ Use `func` to fingerprint instances of the type named `type_name`, and
+    of its subclasses
+    """
+    _fingerprinters[type_name] = func
+
+
+def _find_fingerprinter(obj):
+    return registered_for(_fingerprinters, obj)
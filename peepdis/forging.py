@@ -0,0 +1,251 @@
+""" Finding arguments that a method can be called with
+
+Candidate values for each missing argument come from its annotation, the
+defaults of the other parameters and a pool of simple values. Combinations
+are tried in order until one call succeeds or the attempt budget runs out,
+and the outcome is remembered for the method's type, so a method is only
+searched once.
+"""
+from collections import OrderedDict
+from copy import deepcopy
+from functools import partial
+from inspect import getfullargspec, signature
+from itertools import islice, product
+from threading import RLock
+import typing
+
+from peepdis.datastructures import ArgDict
+from peepdis.execution import (
+    EvaluationTimeout,
+    call_with_timeout,
+    is_process_pool,
+    open_executor,
+)
+
+value_pool = {
+    int: (0, 1, 2, -1),
+    float: (0.5, 1.0, 0.0),
+    complex: (1j,),
+    bool: (True, False),
+    str: ("abc", "a", ""),
+    bytes: (b"abc",),
+    list: ([0, 1, 2], []),
+    tuple: ((0, 1, 2), ()),
+    dict: ({"a": 0}, {}),
+    set: ({0, 1, 2}, set()),
+    type(None): (None,),
+}
+# tried for parameters without an annotation, or with one not in the pool
+untyped_pool = (0, 1, "abc", [0, 1, 2], 0.5, None, True)
+
+
+class ForgeError(ValueError):
+    """ Raised when no arguments could be found for a method """
+
+
+def infer_types(func):
+    """ Return the annotated type of each parameter of `func`, and of its
+    return value as "return"
+    """
+    try:
+        return typing.get_type_hints(func)
+    except Exception:
+        # unresolvable forward references: fall back to the raw annotations
+        return dict(getfullargspec(func).annotations)
+
+
+def candidates_for(annotation, extra=()):
+    """ Values to try for a parameter annotated with `annotation`, starting
+    with `extra`
+    """
+    values = list(extra)
+    if annotation is None:
+        values += untyped_pool
+        return values
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        for member in typing.get_args(annotation):
+            values += candidates_for(member)
+        return values
+    if origin is not None:
+        values += _generic_candidates(origin, typing.get_args(annotation))
+        return values
+    if annotation is typing.Any:
+        values += untyped_pool
+    else:
+        values += value_pool.get(annotation, untyped_pool)
+    return values
+
+
+def _generic_candidates(origin, args):
+    """ Values for generics like `List[int]` or `Dict[str, float]` """
+    elements = [candidates_for(arg)[:3] for arg in args] if args else []
+    if origin in (list, set, frozenset):
+        items = elements[0] if elements else [0, 1, 2]
+        return [origin(items)]
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return [tuple(elements[0])]
+        return [tuple(values[0] for values in elements)]
+    if origin is dict:
+        keys, values = elements if len(elements) == 2 else ([], [])
+        return [dict(zip(keys, values))]
+    return list(value_pool.get(origin, ()))
+
+
+def candidate_args(func, names):
+    """ Yield dicts of values for the parameters `names` of `func`, in the
+    order they should be tried
+    """
+    hints = infer_types(func)
+    spec = getfullargspec(func)
+    defaults = spec.defaults or ()
+    default_values = dict(zip(spec.args[len(spec.args) - len(defaults):], defaults))
+    pools = []
+    for name in names:
+        annotation = hints.get(name)
+        # defaults of other parameters of the same type are likely to work too
+        extra = [
+            value
+            for other, value in default_values.items()
+            if hints.get(other) == annotation
+            and (annotation is not None or isinstance(value, (int, str)))
+        ]
+        pools.append(_unique(candidates_for(annotation, extra)))
+    for values in product(*pools):
+        yield dict(zip(names, values))
+
+
+def _unique(values):
+    unique = []
+    for value in values:
+        if not any(value is other or _same(value, other) for other in unique):
+            unique.append(value)
+    return unique
+
+
+def _same(a, b):
+    try:
+        return type(a) is type(b) and bool(a == b)
+    except Exception:
+        return False
+
+
+def _attempt(func, bound, values, isolate=True, timeout=None):
+    """ Whether calling `func` with the arguments in the `ArgDict` `bound`,
+    and `values` for the rest, succeeds
+    """
+    args, kwargs = bound.call_arguments(values)
+    if isolate:
+        func, args, kwargs = deepcopy((func, args, kwargs))
+    try:
+        call_with_timeout(func, *args, timeout=timeout, **kwargs)
+    except (EvaluationTimeout, Exception):
+        return False
+    return True
+
+
+def recipe_key(func):
+    """ Identifies `func` across instances: the qualified name of the type it's
+    bound to, or of the function itself
+    """
+    owner = getattr(func, "__self__", None)
+    if owner is not None and not isinstance(owner, type(typing)):
+        type_ = owner if isinstance(owner, type) else type(owner)
+        return f"{type_.__module__}.{type_.__qualname__}", func.__name__
+    return getattr(func, "__module__", None) or "", getattr(
+        func, "__qualname__", repr(func)
+    )
+
+
+class RecipeBook:
+    """ LRU cache of the arguments found for each method, or `None` for the
+    methods that none were found for
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._recipes = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._recipes:
+                return default
+            self._recipes.move_to_end(key)
+            return self._recipes[key]
+
+    def put(self, key, args):
+        with self._lock:
+            self._recipes[key] = args
+            self._recipes.move_to_end(key)
+            while len(self._recipes) > self.maxsize:
+                self._recipes.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._recipes.clear()
+
+    def __contains__(self, key):
+        return key in self._recipes
+
+    def __len__(self):
+        return len(self._recipes)
+
+
+_unknown = object()
+
+
+class Forger:
+    """ Searches for arguments to call methods with
+
+    At most `budget` argument sets are tried for each method, each with the
+    `timeout` of the peep, and on `executor` with `workers`, like peep
+    itself. Only "inline" and "thread" executors are supported, since
+    methods aren't generally picklable.
+    """
+
+    def __init__(self, budget=16, executor="inline", workers=None, recipes=None):
+        if executor == "process" or is_process_pool(executor):
+            raise ValueError("methods can't be forged in a process pool")
+        self.budget = budget
+        self.executor = executor
+        self.workers = workers
+        self.recipes = recipes if recipes is not None else RecipeBook()
+
+    def forge(self, func, names, isolate=True, timeout=None, bound=None):
+        """ Return a dict of values for the parameters `names` that `func` can
+        be called with, raising `ForgeError` if none were found
+
+        `bound` is the `ArgDict` of the values already given for the other
+        parameters.
+        """
+        if not names:
+            return {}
+        key = (recipe_key(func), tuple(names))
+        recipe = self.recipes.get(key, _unknown)
+        if recipe is None:
+            raise ForgeError("no arguments found before (cached)")
+        if recipe is not _unknown:
+            return deepcopy(recipe)
+        if bound is None:
+            bound = ArgDict.from_signature(signature(func))
+        args = self._search(func, names, bound, isolate, timeout)
+        self.recipes.put(key, args)
+        if args is None:
+            raise ForgeError(f"no arguments found in {self.budget} attempts")
+        return deepcopy(args)
+
+    def _search(self, func, names, bound, isolate, timeout):
+        attempts = list(islice(candidate_args(func, names), self.budget))
+        attempt = partial(_attempt, func, bound, isolate=isolate, timeout=timeout)
+        with open_executor(self.executor, self.workers) as pool:
+            # lazy with the inline executor, and the attempts still queued in
+            # other pools are cancelled once one succeeds
+            for args, succeeded in zip(attempts, pool.map(attempt, attempts)):
+                if succeeded:
+                    return args
+        return None
+
+
+forger = Forger()
@@ -0,0 +1,363 @@
+from collections import OrderedDict
+from inspect import Parameter, getattr_static, signature
+import sys
+from threading import RLock
+from types import (
+    CodeType,
+    FunctionType,
+    GetSetDescriptorType,
+    MemberDescriptorType,
+    MethodType,
+    ModuleType,
+)
+import weakref
+
+
+class TypeInfo:
+    """ Introspection results shared by every instance of a type
+
+    Only class-level members are recorded here. Members set on an instance
+    are looked up on that instance each time, since they can differ between
+    instances.
+    """
+
+    def __init__(self, type_):
+        self.names = frozenset(dir(type_))
+        # a custom `__dir__` can list different names for each instance
+        self.custom_dir = type_.__dir__ is not object.__dir__
+        self.kinds = {}
+        self.signatures = {}
+        self.dependencies = {}
+        self._filtered = {}
+
+    def filtered_names(self, builtins=True, privates=True):
+        key = (builtins, privates)
+        if key not in self._filtered:
+            self._filtered[key] = filter_names(self.names, builtins, privates)
+        return self._filtered[key]
+
+
+class TypeCache:
+    """ LRU cache of `TypeInfo`, holding only weak references to the types """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, type_) -> TypeInfo:
+        key = weakref.ref(type_, self._discard)
+        with self._lock:
+            info = self._entries.get(key)
+            if info is None:
+                info = self._entries[key] = TypeInfo(type_)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return info
+
+    def invalidate(self, type_=None):
+        """ Forget what's known about `type_`, or about every type if `None` """
+        with self._lock:
+            if type_ is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(weakref.ref(type_), None)
+
+    def _discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __contains__(self, type_):
+        return weakref.ref(type_) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+type_cache = TypeCache()
+
+
+def _type_info(obj):
+    """ Return the cached `TypeInfo` for `obj`, or `None` if it can't be shared
+
+    Modules and classes each have their own members, so nothing about them
+    can be shared through their type.
+    """
+    if isinstance(obj, (ModuleType, type)):
+        return None
+    try:
+        return type_cache.get(type(obj))
+    except TypeError:
+        return None
+
+
+def member_names(obj, builtins=True, privates=True):
+    """ Sorted names of the members of `obj`, like a filtered `dir(obj)` """
+    info = _type_info(obj)
+    if info is None or info.custom_dir:
+        return filter_names(dir(obj), builtins, privates)
+    instance_names = _instance_dict(obj)
+    if not instance_names:
+        return info.filtered_names(builtins, privates)
+    return filter_names(info.names.union(instance_names), builtins, privates)
+
+
+def filter_names(names, builtins=True, privates=True):
+    if builtins is False:
+        names = [x for x in names if not _is_magic(x)]
+    if privates is False:
+        names = [x for x in names if not _is_private(x)]
+    return tuple(sorted(names))
+
+
+def _is_magic(name):
+    return name.startswith("__") and name.endswith("__")
+
+
+def _is_private(name):
+    return name.startswith("_") and not name.endswith("_")
+
+
+def classify(obj, name):
+    """ Return whether the member `name` of `obj` is an "attr", "method",
+    "property" or "builtin" (a callable implemented in C)
+
+    This is decided without accessing the member, so no property or other
+    descriptor is run. Members that only exist through `__getattr__` are
+    computed on access, so they count as properties.
+    """
+    info = _type_info(obj)
+    if info is None or name not in info.names or name in _instance_dict(obj):
+        return _static_kind(obj, name)
+    kind = info.kinds.get(name)
+    if kind is None:
+        kind = info.kinds[name] = _static_kind(obj, name)
+    return kind
+
+
+def get_signature(obj, name, attr):
+    """ Return `inspect.signature(attr)` for the member `name` of `obj`, or
+    `None` if it can't be determined
+
+    C builtins are covered through their `__text_signature__`.
+    """
+    info = _type_info(obj)
+    if info is None or name not in info.names or name in _instance_dict(obj):
+        return _signature(attr)
+    if name not in info.signatures:
+        info.signatures[name] = _signature(attr)
+    return info.signatures[name]
+
+
+def member_dependencies(obj, name):
+    """ Names of the members of `obj` that the member `name` may read, or
+    `None` if that can't be worked out
+
+    Found from the names used in the code of python methods and properties,
+    following calls to other members. Anything read from outside `obj`, like
+    globals or arguments, isn't included.
+    """
+    info = _type_info(obj)
+    if info is None or name not in info.names or name in _instance_dict(obj):
+        return _dependencies(obj, name)
+    if name not in info.dependencies:
+        info.dependencies[name] = _dependencies(obj, name)
+    return info.dependencies[name]
+
+
+# names that let code read members without naming them
+_dynamic_names = frozenset(("getattr", "hasattr", "vars", "__dict__", "super"))
+
+
+def _dependencies(obj, name):
+    names = set()
+    pending = [name]
+    seen = set()
+    while pending:
+        member = pending.pop()
+        seen.add(member)
+        code = _member_code(obj, member)
+        if code is None:
+            return None
+        used = _code_names(code)
+        if used & _dynamic_names:
+            return None
+        for used_name in used:
+            names.add(used_name)
+            if used_name in seen or used_name in _instance_dict(obj):
+                continue
+            if classify(obj, used_name) != "attr" and hasattr(type(obj), used_name):
+                pending.append(used_name)
+    return frozenset(names)
+
+
+def _member_code(obj, name):
+    if name in _instance_dict(obj):
+        return None
+    try:
+        raw = getattr_static(type(obj), name)
+    except AttributeError:
+        return None
+    if isinstance(raw, (staticmethod, classmethod)):
+        raw = raw.__func__
+    elif isinstance(raw, property):
+        raw = raw.fget
+    return getattr(raw, "__code__", None) if isinstance(raw, FunctionType) else None
+
+
+def _code_names(code):
+    """ Names used by `code`, including in nested functions and lambdas """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _signature(func):
+    try:
+        return signature(func)
+    except (TypeError, ValueError):
+        return None
+
+
+_variadic = (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)
+
+
+def required_args(sig):
+    """ Names of the parameters in `sig` that have to be given to call it """
+    return tuple(
+        name
+        for name, param in sig.parameters.items()
+        if param.default is Parameter.empty and param.kind not in _variadic
+    )
+
+
+def type_key(obj):
+    """ Fully qualified name of the type of `obj`, or of `obj` itself if it's
+    a module
+    """
+    if isinstance(obj, ModuleType):
+        return obj.__name__
+    type_ = type(obj)
+    return f"{type_.__module__}.{type_.__qualname__}"
+
+
+def registered_for(registry, obj):
+    """ The entry of `registry`, a dict keyed by fully qualified type names,
+    for the most specific class of `obj` that has one, or `None`
+
+    Each class in the MRO of the type of `obj` matches the name it was
+    defined under, and any registered name it can be imported by, like
+    `pandas.DataFrame`, so subclasses and classes that moved between modules
+    are found too. Names are only looked up in modules already imported.
+
+    The name matched for each type is cached until names are added to or
+    removed from `registry`, or more modules are imported.
+    """
+    state = (len(sys.modules), tuple(registry))
+    cached = _registry_names.get(id(registry))
+    if cached is None or cached[0] is not registry or cached[1] != state:
+        cached = (registry, state, weakref.WeakKeyDictionary())
+        _registry_names[id(registry)] = cached
+    names = cached[2]
+    type_ = type(obj)
+    try:
+        name = names[type_]
+    except KeyError:
+        name = names[type_] = _registered_name(registry, type_)
+    # looked up each time, so that replacing an entry needs no invalidation
+    return None if name is None else registry.get(name)
+
+
+# for each registry, by its id: the registry, the state its names were
+# resolved in, and the name matched for each type
+_registry_names = {}
+
+
+def _registered_name(registry, type_):
+    """ The name in `registry` that the most specific class of `type_` matches,
+    or `None`
+    """
+    resolved = {}
+    for name in registry:
+        class_ = _imported_class(name)
+        if class_ is not None:
+            resolved.setdefault(class_, name)
+    for class_ in type_.__mro__:
+        name = f"{class_.__module__}.{class_.__qualname__}"
+        if name in registry:
+            return name
+        if class_ in resolved:
+            return resolved[class_]
+    return None
+
+
+def _imported_class(name):
+    """ The class named `name`, if the module it's in is already imported """
+    parts = name.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        module = sys.modules.get(".".join(parts[:i]))
+        if module is None:
+            continue
+        class_ = module
+        for part in parts[i:]:
+            class_ = getattr(class_, part, None)
+        return class_ if isinstance(class_, type) else None
+    return None
+
+
+def _instance_dict(obj):
+    return getattr(obj, "__dict__", None) or {}
+
+
+def instance_attributes(obj):
+    """ Dict of the attributes stored on `obj` itself, in its `__dict__` or
+    `__slots__`, or `None` if it has neither
+    """
+    state = getattr(obj, "__dict__", None)
+    slots = [
+        name
+        for cls in type(obj).__mro__
+        for name in getattr(cls, "__slots__", ())
+        if name not in ("__dict__", "__weakref__")
+    ]
+    if state is None and not slots:
+        return None
+    state = dict(state) if state is not None else {}
+    for name in slots:
+        if hasattr(obj, name):
+            state[name] = getattr(obj, name)
+    return state
+
+
+def kind_of(attr):
+    """ Return the kind of an already accessed member """
+    if not callable(attr):
+        return "attr"
+    if isinstance(attr, (FunctionType, MethodType)):
+        return "method"
+    return "builtin"
+
+
+# descriptors for fields stored in C structs and `__slots__`, which are read
+# without running any python code
+_field_descriptors = (GetSetDescriptorType, MemberDescriptorType)
+
+
+def _static_kind(obj, name):
+    try:
+        raw = getattr_static(obj, name)
+    except AttributeError:
+        return "property"
+    if isinstance(raw, (staticmethod, classmethod)):
+        return kind_of(raw.__func__)
+    if isinstance(raw, FunctionType):
+        return "method"
+    if isinstance(raw, _field_descriptors):
+        return "attr"
+    if hasattr(type(raw), "__get__") and not callable(raw):
+        return "property"
+    return kind_of(raw)
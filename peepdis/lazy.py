@@ -0,0 +1,93 @@
+""" Evaluating members only when they're looked at """
+import sys
+
+from peepdis.core import Peeper
+from peepdis.datastructures import _builtin_names
+from peepdis.introspection import member_names
+from peepdis.rendering import LineBuffer, colorize_as
+
+
+def browse(obj, page_size=20, verbose=False, isolation="deepcopy", **kwargs):
+    """ Print the first page of the members of `obj` and return a `Pager` to
+    show the others, evaluating only the members that are shown
+
+    Options for evaluating members, like `timeout` or `properties`, are
+    passed on to `Peeper.evaluate`.
+    """
+    pager = Pager(LazyPeeper(obj, isolation=isolation, **kwargs), page_size, verbose)
+    pager.show()
+    return pager
+
+
+class LazyPeeper(Peeper):
+    """ A `Peeper` that evaluates each member the first time it's looked up
+
+    `peeper[name]` evaluates the member and keeps its `Output`, so looking it
+    up again costs nothing. Like any `Peeper`, iterating over it or its
+    categories only covers the members evaluated so far, and `names` lists
+    them all.
+    """
+
+    def __init__(self, obj, isolation="deepcopy", **kwargs):
+        super().__init__(obj, isolation=isolation)
+        self.options = kwargs
+        self.names = list(member_names(self.obj))
+
+    def __missing__(self, name):
+        if name not in self.dir:
+            raise KeyError(name)
+        output = self.evaluate(name, **self.options)
+        self._index(output)
+        return output
+
+
+class Pager:
+    """ Shows the members of a `LazyPeeper` a page at a time
+
+    Only the members on the pages shown are evaluated. Builtins are skipped
+    unless `verbose`, without evaluating them.
+    """
+
+    def __init__(self, peeper: LazyPeeper, page_size=20, verbose=False):
+        self.peeper = peeper
+        self.page_size = page_size
+        builtins = () if verbose else _builtin_names()
+        self.names = [name for name in peeper.names if name not in builtins]
+        self.page = 0
+
+    @property
+    def n_pages(self):
+        return max(-(-len(self.names) // self.page_size), 1)
+
+    def render(self, page=None):
+        """ The lines of `page`, or of the current page """
+        page = self.page if page is None else page
+        start = page * self.page_size
+        names = self.names[start : start + self.page_size]
+        lines = [self.peeper[name].render() for name in names]
+        footer = (
+            f"page {page + 1} of {self.n_pages}, "
+            f"members {start + 1}-{start + len(names)} of {len(self.names)}"
+        )
+        lines.append(colorize_as(footer, "null"))
+        return lines
+
+    def show(self, page=None):
+        """ Print `page`, or the current page, and make it the current page """
+        if page is not None:
+            if not 0 <= page < self.n_pages:
+                raise IndexError(f"page {page} out of range for {self.n_pages} pages")
+            self.page = page
+        buffer = LineBuffer()
+        for line in self.render():
+            buffer.add(line)
+        buffer.write(sys.stdout)
+
+    def next(self):
+        self.show(min(self.page + 1, self.n_pages - 1))
+
+    def previous(self):
+        self.show(max(self.page - 1, 0))
+
+    def __repr__(self):
+        return "\n".join(self.render())
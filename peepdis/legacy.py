@@ -1,6 +1,8 @@
+from contextlib import nullcontext
 from copy import deepcopy
+from functools import lru_cache, partial
 import re
-from termcolor import colored
+from time import monotonic
 from types import (
     BuiltinMethodType,
     BuiltinFunctionType,
@@ -10,20 +12,83 @@ from types import (
 )
 import sys
 
+from peepdis.execution import (
+    EvaluationTimeout,
+    call_in_fork,
+    call_with_timeout,
+    check_isolation,
+    open_executor,
+    worker_task,
+)
+from peepdis.introspection import (
+    classify,
+    get_signature,
+    member_names,
+    required_args,
+    type_key,
+)
+from peepdis.profiling import MemberProfile, Profile, Timer, measure, tracing
+from peepdis.rendering import LineBuffer, colorize, colorize_as, shorten
+from peepdis.scheduling import cheapest_first, cost_model, overdue_message
+from peepdis.summaries import summarize
+
 
 def peep(obj, builtins=False, privates=False, docstrings=False,
-         truncate_len=250):
-    if not isinstance(obj, ModuleType):
-        obj = deepcopy(obj)
-    obj_dir = dir(obj)
-    output = OutputStrWrapper(truncate_len)
-    if builtins is False:
-        _is_magic = lambda x: (x.startswith("__") and x.endswith("__"))
-        obj_dir = [x for x in obj_dir if not _is_magic(x)]
-
-    if privates is False:
-        _is_private = lambda x: (x.startswith("_") and not x.endswith("_"))
-        obj_dir = [x for x in obj_dir if not _is_private(x)]
+         truncate_len=250, timeout=None, executor="inline", workers=None,
+         isolation="deepcopy", file=None, properties=False, profile=False,
+         cache=False, deadline=None):
+    """ Evaluate and color code the attributes and methods of `obj`
+
+    Output is collected and returned for printing, unless a writable `file`
+    is given, in which case each line is written to it as soon as its member
+    has been evaluated. Properties, and other members computed on access, are
+    only evaluated if `properties` is True.
+
+    With `profile`, the time spent copying, calling and rendering each member
+    and its peak memory allocation are recorded. A table of the slowest
+    members is added to the output, and all of them are kept as the
+    `profile` attribute of the returned output.
+
+    With `cache`, the output is remembered and returned straight away if the
+    same object is peeped again with the same options, as long as a shallow
+    fingerprint of its state hasn't changed. Pass a `ResultCache` to use
+    instead of the shared one.
+
+    `deadline` is a time budget in seconds for the whole peep. Attributes are
+    evaluated first, then the other members from the one expected to be
+    quickest, going by how long they took in earlier peeps of the same type.
+    Each member's timeout is cut to the time left, and the members left once
+    it has passed are listed at the end instead of being evaluated.
+    """
+    check_isolation(isolation)
+    results_cache = None
+    # an empty `ResultCache` is falsy, so compare with False itself
+    if cache is not False and cache is not None:
+        from peepdis.caching import get_cache
+
+        results_cache = get_cache(cache)
+    # peeping a callable calls it, profiling needs a real evaluation, and a
+    # deadline can leave the output incomplete
+    if callable(obj) or profile or deadline is not None:
+        results_cache = None
+    options = (builtins, privates, docstrings, truncate_len, timeout,
+               isolation, properties)
+    if results_cache is not None:
+        lines = results_cache.get(obj, options)
+        if lines is not None:
+            print(colorize(getattr(obj, "__name__", ""), "red"))
+            output = OutputStrWrapper(truncate_len, file)
+            for line in lines:
+                output.add_line(line)
+            return output
+    original = obj
+    timer = Timer()
+    # with fork isolation, each member is evaluated in a copy-on-write child
+    if isolation == "deepcopy" and not isinstance(obj, ModuleType):
+        with timer.phase("copy"):
+            obj = deepcopy(obj)
+    obj_dir = member_names(obj, builtins, privates)
+    output = OutputStrWrapper(truncate_len, file)
 
     # check if debugging and define output function
     gettrace = getattr(sys, "gettrace", None)
@@ -32,11 +97,14 @@ def peep(obj, builtins=False, privates=False, docstrings=False,
     else:
         debug = False
 
-    print(colored(getattr(obj, "__name__", ""), "red"))
+    print(colorize(getattr(obj, "__name__", ""), "red"))
     doc = getattr(obj, "__doc__", "")
     if callable(obj):
         try:
-            print(obj())
+            if isolation == "fork":
+                print(call_in_fork(lambda: str(obj())))
+            else:
+                print(obj())
         except Exception as e:
             if _positional_exception(e):
                 msg = "(requires positional arguments)"
@@ -45,71 +113,211 @@ def peep(obj, builtins=False, privates=False, docstrings=False,
                 msg = f"RAISES EXCEPTION : {e}"
                 msg_color = "red"
             output.add(
-                colored(f"{obj}(): ", "magenta"),
-                colored(msg, msg_color),
-                colored(doc, "green"),
+                colorize(f"{obj}(): ", "magenta"),
+                colorize(msg, msg_color),
+                colorize(doc, "green"),
             )
-            print(colored(msg, "grey"))
-        print(colored(obj.__doc__, "green"))
+            print(colorize(msg, "grey"))
+        print(colorize(obj.__doc__, "green"))
 
-    for item in obj_dir:
-        attr = getattr(obj, item)
-        doc = ""
-        try:
-            if docstrings and attr.__doc__ is not None:
-                doc = "\n" + attr.__doc__
-            eval_str = str(attr)
+    # each callable gets its own copy, whatever the executor, so that methods
+    # that change the object can't change what the others see
+    evaluate = partial(_profile_item if profile else _evaluate_item, obj,
+                       docstrings=docstrings, timeout=timeout,
+                       isolate=isolation == "deepcopy", properties=properties)
+    if isolation == "fork":
+        evaluate = partial(call_in_fork, evaluate)
+    stop_at = None
+    overdue_text = colorize_as(overdue_message, "null")
+    if deadline is not None:
+        obj_dir = cheapest_first(obj, obj_dir, type_key(obj))
+        stop_at = monotonic() + deadline
+    evaluate = partial(_scheduled, evaluate, obj, timeout, stop_at, profile,
+                       overdue_text)
+    with open_executor(executor, workers, shared=evaluate) as pool, \
+            _tracing_if(profile):
+        # worker processes are sent `obj` once rather than with each member
+        results = pool.map(worker_task(pool, evaluate), obj_dir)
+        overdue = []
+        if not profile:
+            lines = []
+            for item, row in zip(obj_dir, results):
+                if row[1] == overdue_text:
+                    overdue.append(item)
+                lines.append(output.add(*row))
+            _add_overdue(output, overdue)
+            if results_cache is not None:
+                results_cache.put(original, options, lines)
+            return output
+        output.profile = Profile()
+        if timer.timings:
+            output.profile.append(MemberProfile("(object copy)", timer.timings))
+        for item, (row, timings) in zip(obj_dir, results):
+            if row[1] == overdue_text:
+                overdue.append(item)
+            output.add(*row)
+            output.profile.append(MemberProfile(item, timings))
+        _add_overdue(output, overdue)
+    for line in output.profile.table().split("\n"):
+        output.add(line)
+    return output
+
+
+def _scheduled(evaluate, obj, timeout, stop_at, profile, overdue_text, item):
+    """ `evaluate(item)`, recording how long it took, with its timeout cut to
+    the time left before the `monotonic` time `stop_at`, if there is one
+
+    If no time is left, it isn't evaluated, and `overdue_text` is shown.
+    """
+    if stop_at is not None:
+        remaining = stop_at - monotonic()
+        if remaining <= 0:
+            if classify(obj, item) in ("method", "builtin"):
+                row = (colorize(f"{item}(): ", "magenta"), overdue_text)
+            else:
+                row = (colorize(f"{item}: ", "cyan"), overdue_text)
+            return (row, {}) if profile else row
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    start = monotonic()
+    result = evaluate(item, timeout=timeout)
+    elapsed = monotonic() - start
+    timed_out = timeout is not None and elapsed >= timeout
+    cost_model.observe(type_key(obj), item, elapsed, timed_out)
+    return result
+
+
+def _add_overdue(output, overdue):
+    if overdue:
+        output.add(colorize_as(
+            f"deadline passed before {len(overdue)} members were evaluated: "
+            f"{', '.join(overdue)}", "timeout"))
+
+
+def _tracing_if(profile):
+    return tracing() if profile else nullcontext()
+
+
+def _profile_item(obj, item, **kwargs):
+    """ `_evaluate_item`, also returning where its time and memory went """
+    timer = Timer()
+    with measure(timer.timings):
+        row = _evaluate_item(obj, item, timer=timer, **kwargs)
+    return row, timer.timings
+
+
+def _evaluate_item(obj, item, docstrings=False, timeout=None, isolate=False,
+                   properties=False, timer=None):
+    """ Evaluate one member of `obj` into the fragments of its output line """
+    timer = timer if timer is not None else Timer()
+    if not properties and classify(obj, item) == "property":
+        return (
+            colorize(f"{item}: ", "cyan"),
+            colorize("(property, not evaluated)", "grey"),
+        )
+    try:
+        attr = call_with_timeout(getattr, obj, item, timeout=timeout)
+    except EvaluationTimeout as e:
+        return (
+            colorize(f"{item}: ", "cyan"),
+            colorize_as(f"(timed out after {e.timeout:.3g}s)", "timeout"),
+        )
+    except Exception as e:
+        # raising properties and attributes, like `ndarray.mT` of a 1d array
+        return (
+            colorize(f"{item}: ", "cyan"),
+            colorize(f"RAISES EXCEPTION : {e}", "red"),
+        )
+    doc = ""
+    try:
+        if docstrings and attr.__doc__ is not None:
+            doc = "\n" + attr.__doc__
+        if callable(attr) is False:
+            eval_str = call_with_timeout(_render, attr, timer, timeout=timeout)
             eval_str = "" if eval_str == "None" else eval_str
-            if callable(attr) is False:
-                eval_str = _fix_if_multiline(eval_str)
-                output.add(
-                    colored(f"{item}: ", "cyan"),
-                    eval_str,
-                    colored(doc, "green")
-                )
-        except (Exception, BaseException) as e:
-            output.add(
-                colored(f"{item}: ", "cyan"),
-                colored(f"RAISES EXCEPTION : {e}", "red"),
-                colored(doc, "green"),
+            eval_str = _fix_if_multiline(eval_str)
+            return (
+                colorize(f"{item}: ", "cyan"),
+                eval_str,
+                colorize(doc, "green")
             )
-            continue
-        if callable(attr):
-            try:
-                msg = str(attr())
-                msg = _fix_if_multiline(msg)
-                output.add(
-                    colored(f"{item}(): ", "magenta"),
-                    msg,
-                    colored(doc, "green")
-                )
-            except (Exception, BaseException) as e:
-                if _positional_exception(e):
-                    msg = "(requires positional arguments)"
-                    msg_color = "grey"
-                else:
-                    msg = f"RAISES EXCEPTION : {e}"
-                    msg_color = "red"
-                output.add(
-                    colored(f"{item}(): ", "magenta"),
-                    colored(msg, msg_color),
-                    colored(doc, "green"),
-                )
-                continue
-    return output
+    except EvaluationTimeout as e:
+        return (
+            colorize(f"{item}: ", "cyan"),
+            colorize_as(f"(timed out after {e.timeout:.3g}s)", "timeout"),
+            colorize(doc, "green"),
+        )
+    except (Exception, BaseException) as e:
+        return (
+            colorize(f"{item}: ", "cyan"),
+            colorize(f"RAISES EXCEPTION : {e}", "red"),
+            colorize(doc, "green"),
+        )
+    sig = get_signature(obj, item, attr)
+    if sig is not None and required_args(sig):
+        # no need to copy or call it just to find out from the exception
+        return (
+            colorize(f"{item}(): ", "magenta"),
+            colorize("(requires positional arguments)", "grey"),
+            colorize(doc, "green"),
+        )
+    if isolate and not isinstance(obj, ModuleType):
+        with timer.phase("copy"):
+            attr = getattr(deepcopy(obj), item)
+    try:
+        msg = call_with_timeout(_call_and_render, attr, timer, timeout=timeout)
+        msg = _fix_if_multiline(msg)
+        return (
+            colorize(f"{item}(): ", "magenta"),
+            msg,
+            colorize(doc, "green")
+        )
+    except EvaluationTimeout as e:
+        return (
+            colorize(f"{item}(): ", "magenta"),
+            colorize_as(f"(timed out after {e.timeout:.3g}s)", "timeout"),
+            colorize(doc, "green"),
+        )
+    except (Exception, BaseException) as e:
+        if _positional_exception(e):
+            msg = "(requires positional arguments)"
+            msg_color = "grey"
+        else:
+            msg = f"RAISES EXCEPTION : {e}"
+            msg_color = "red"
+        return (
+            colorize(f"{item}(): ", "magenta"),
+            colorize(msg, msg_color),
+            colorize(doc, "green"),
+        )
+
+
+def _call_and_render(func, timer):
+    with timer.phase("call"):
+        result = func()
+    return _render(result, timer)
+
+
+def _render(value, timer):
+    with timer.phase("render"):
+        summary = summarize(value)
+        return str(value) if summary is None else summary
 
 
 class OutputStrWrapper:
-    def __init__(self, max_len):
+    def __init__(self, max_len, file=None):
         self._max_len = max_len
-        self._output_str = ''
+        self._buffer = LineBuffer(file)
 
     def add(self, *args):
-        str_ = _shorten(*args, max_len=self._max_len)
-        self._output_str += str_ + '\n'
+        line = shorten(*args, max_len=self._max_len)
+        self._buffer.add(line)
+        return line
+
+    def add_line(self, line):
+        self._buffer.add(line)
 
     def __repr__(self):
-        return str(self._output_str)
+        return self._buffer.getvalue()
 
     def __str__(self):
         return repr(self)
@@ -122,14 +330,6 @@ class Peeper:
         pass
 
 
-def _shorten(*args, max_len):
-    str_ = "".join(args)
-    if max_len:
-        if len(str_) > max_len:
-            str_ = str_[:max_len] + " ..."
-    return str_
-
-
 def _fix_if_multiline(msg):
     if "\n" in msg:
         return "\n" + msg
@@ -137,14 +337,23 @@ def _fix_if_multiline(msg):
         return msg
 
 
+_positional_msgs = ('required argument', 'positional argument',
+                    'missing argument', 'requires argument', 'must be given',
+                    'takes exactly')
+_positional_re_msgs = (re.compile(r'exactly . argument'),
+                       re.compile(r'at least .* argument'))
+
+
 def _positional_exception(e):
-    e = str(e).lower()
-    msgs = ('required argument', 'positional argument', 'missing argument',
-            'requires argument', 'must be given', 'takes exactly')
-    re_msgs = (r'exactly . argument', r'at least .* argument', )
-    if any([msg in e for msg in msgs]):
+    """ Fallback for callables whose signature can't be read """
+    return _is_positional_msg(str(e).lower())
+
+
+@lru_cache(maxsize=1024)
+def _is_positional_msg(e):
+    if any(msg in e for msg in _positional_msgs):
         return True
-    if any([re.compile(msg).search(e) for msg in re_msgs]):
+    if any(msg.search(e) for msg in _positional_re_msgs):
         return True
     else:
         return False
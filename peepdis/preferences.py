@@ -1,8 +1,11 @@
 class _PreferencesMixin:
+    # no instance dict, so that subclasses can be slotted
+    __slots__ = ()
     _color_scheme = {
         "error": "red",
         "callable_": "cyan",
         "attr": "magenta",
+        "property": "magenta",
         "message": "white",
         "null": "grey",
         "forged": "yellow",
@@ -10,6 +13,11 @@ class _PreferencesMixin:
         "default": "grey",
         "None": "grey",
         "builtin": "grey",
+        "timeout": "blue",
+        "added": "green",
+        "removed": "red",
+        "modified": "yellow",
+        "state_change": "yellow",
     }
     _display_type_annotations = True
 
@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+from time import perf_counter
+import tracemalloc
+
+
+class Timer:
+    """ Accumulates the time spent in each named phase of an evaluation """
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+
+@contextmanager
+def tracing():
+    """ Trace allocations with `tracemalloc`, unless something already is """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def measure(timings):
+    """ Record the total time and peak allocation of the block in `timings`
+
+    The peak is only recorded while `tracemalloc` is tracing. It covers every
+    thread, so it's only specific to one member when they're evaluated one at
+    a time.
+    """
+    traced = tracemalloc.is_tracing()
+    if traced:
+        _reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings["total"] = perf_counter() - start
+        if traced:
+            _, peak = tracemalloc.get_traced_memory()
+            timings["peak_bytes"] = max(peak - baseline, 0)
+
+
+def _reset_peak():
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        # python < 3.9: restarting is the only way to reset the peak
+        tracemalloc.stop()
+        tracemalloc.start()
+
+
+class MemberProfile:
+    """ Where the time and memory went when evaluating one member """
+
+    _phases = ("copy", "call", "render")
+
+    def __init__(self, name, timings):
+        self.name = name
+        phases_total = sum(timings.get(phase, 0.0) for phase in self._phases)
+        self.total = timings.get("total", phases_total)
+        self.copy = timings.get("copy", 0.0)
+        self.call = timings.get("call", 0.0)
+        self.render = timings.get("render", 0.0)
+        self.peak_bytes = timings.get("peak_bytes")
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "total": self.total,
+            "copy": self.copy,
+            "call": self.call,
+            "render": self.render,
+            "peak_bytes": self.peak_bytes,
+        }
+
+    def __repr__(self):
+        return f"MemberProfile({self.to_dict()})"
+
+
+class Profile(list):
+    """ `MemberProfile` for each member of a peep """
+
+    def slowest(self, n=10):
+        return sorted(self, key=lambda member: member.total, reverse=True)[:n]
+
+    def to_dicts(self):
+        return [member.to_dict() for member in self]
+
+    def table(self, n=10):
+        """ Format the `n` slowest members as a table, times in milliseconds """
+        header = (
+            f"{'slowest members':<30} {'total':>10} {'copy':>10} {'call':>10} "
+            f"{'render':>10} {'peak KiB':>10}"
+        )
+        lines = [header]
+        for member in self.slowest(n):
+            peak = member.peak_bytes
+            peak_str = f"{peak / 1024:10.1f}" if peak is not None else f"{'-':>10}"
+            lines.append(
+                f"{member.name[:30]:<30} {member.total * 1e3:10.3f} "
+                f"{member.copy * 1e3:10.3f} {member.call * 1e3:10.3f} "
+                f"{member.render * 1e3:10.3f} {peak_str}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.table()
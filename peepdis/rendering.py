@@ -0,0 +1,144 @@
+from functools import lru_cache
+import os
+import reprlib
+import sys
+
+from peepdis.preferences import _PreferencesMixin
+from peepdis.summaries import summarize
+
+# forced on or off by `set_color`, or `None` to decide from the environment
+_forced = None
+# the stdout that color was last decided for, and the decision
+_decision = (None, False)
+
+
+def set_color(enabled=None):
+    """ Turn colored output on or off, or with `None`, decide again from the
+    environment
+    """
+    global _forced, _decision
+    _forced = enabled
+    _decision = (None, False)
+
+
+def color_enabled():
+    """ Whether to color output, which by default is only when stdout is a
+    terminal and `NO_COLOR` isn't set
+
+    The decision is remembered until stdout is replaced, so this is cheap
+    enough to check for every fragment.
+    """
+    global _decision
+    if _forced is not None:
+        return _forced
+    stream, enabled = _decision
+    if stream is not sys.stdout:
+        enabled = _detect_color(sys.stdout)
+        _decision = (sys.stdout, enabled)
+    return enabled
+
+
+def _detect_color(stream):
+    # the same rules as `termcolor`
+    env = os.environ
+    if "ANSI_COLORS_DISABLED" in env or "NO_COLOR" in env:
+        return False
+    if "FORCE_COLOR" in env:
+        return True
+    if env.get("TERM") == "dumb":
+        return False
+    try:
+        return stream.isatty()
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _escapes(color):
+    """ Escape sequences that `termcolor` wraps around text in `color` """
+    # only imported once something is actually colored
+    from termcolor import colored
+
+    try:
+        text = colored("\0", color, force_color=True)
+    except TypeError:
+        # termcolor < 2.1 always colors
+        text = colored("\0", color)
+    prefix, _, suffix = text.partition("\0")
+    return prefix, suffix
+
+
+def colorize(text, color):
+    """ Same as `termcolor.colored`, with the escape sequences looked up once,
+    and nothing added when color is off
+    """
+    if not color_enabled():
+        return str(text)
+    prefix, suffix = _escapes(color)
+    return prefix + str(text) + suffix
+
+
+def colorize_as(text, key):
+    """ Color `text` as the `_PreferencesMixin._color_scheme` entry for `key` """
+    return colorize(text, _PreferencesMixin._color_scheme[key])
+
+
+def shorten(*fragments, max_len):
+    """ Join `fragments`, truncating after `max_len` characters
+
+    Fragments after the cutoff are never joined, so a huge one at the end of
+    a line costs nothing.
+    """
+    if not max_len:
+        return "".join(fragments)
+    kept = []
+    length = 0
+    for fragment in fragments:
+        if length + len(fragment) > max_len:
+            kept.append(fragment[: max_len - length] + " ...")
+            break
+        kept.append(fragment)
+        length += len(fragment)
+    return "".join(kept)
+
+
+_repr = reprlib.Repr()
+_repr.maxlist = _repr.maxtuple = _repr.maxset = _repr.maxdict = 50
+_repr.maxstring = _repr.maxother = 1000
+
+
+def bounded_repr(value, max_len=250):
+    """ `repr` of `value`, truncated after `max_len` characters
+
+    Builtin containers are only rendered as far as needed, and large arrays
+    and DataFrames are summarized, so this stays cheap for huge values.
+    """
+    summary = summarize(value)
+    if summary is not None:
+        return shorten(summary, max_len=max_len)
+    return shorten(_repr.repr(value), max_len=max_len)
+
+
+class LineBuffer:
+    """ Collects output lines to be joined and written once
+
+    If `file` is given, each line is written to it immediately instead.
+    """
+
+    def __init__(self, file=None):
+        self._lines = []
+        self._file = file
+
+    def add(self, line):
+        if self._file is None:
+            self._lines.append(line + "\n")
+        else:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def getvalue(self):
+        return "".join(self._lines)
+
+    def write(self, file):
+        file.write(self.getvalue())
+        file.flush()
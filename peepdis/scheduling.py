@@ -0,0 +1,91 @@
+""" Ordering members by how long they're expected to take
+
+A deadline for a whole peep is best spent on the cheap members first, so
+that as many as possible are shown before it passes. Plain attributes cost
+next to nothing, and the cost of the rest is learned from how long they took
+when objects of the same type were peeped before.
+"""
+from collections import OrderedDict
+from threading import RLock
+
+from peepdis.introspection import classify
+
+# seconds expected for members of each kind that haven't been timed yet
+default_costs = {"attr": 0.0, "builtin": 1e-4, "property": 1e-3, "method": 1e-2}
+# shown in place of the value of members the deadline passed before
+overdue_message = "(not evaluated, deadline passed)"
+
+
+class CostModel:
+    """ Expected time to evaluate each member, by the qualified name of its
+    type and its name
+
+    Each new timing is averaged with the expected time so far with `weight`,
+    so the estimate follows members that get slower or faster. Up to
+    `maxsize` members are remembered, dropping the least recently timed.
+    """
+
+    def __init__(self, weight=0.5, maxsize=100_000):
+        self.weight = weight
+        self.maxsize = maxsize
+        self._costs = OrderedDict()
+        self._lock = RLock()
+
+    def observe(self, type_name, name, seconds, timed_out=False):
+        """ Record that evaluating `name` took `seconds`, or at least that long
+        if it `timed_out`
+        """
+        key = (type_name, name)
+        with self._lock:
+            previous = self._costs.pop(key, None)
+            if timed_out:
+                # only a lower bound, so it can't make the estimate smaller
+                seconds = max(seconds, previous or 0.0)
+            elif previous is not None:
+                seconds = self.weight * seconds + (1 - self.weight) * previous
+            self._costs[key] = seconds
+            while len(self._costs) > self.maxsize:
+                self._costs.popitem(last=False)
+
+    def expected(self, type_name, name, default=None):
+        """ Expected seconds to evaluate `name`, or `default` if it hasn't been
+        timed
+        """
+        return self._costs.get((type_name, name), default)
+
+    def clear(self):
+        with self._lock:
+            self._costs.clear()
+
+    def __len__(self):
+        return len(self._costs)
+
+
+cost_model = CostModel()
+
+
+def cheapest_first(obj, names, type_name, history=None, costs=None):
+    """ `names` in the order they should be evaluated in under a deadline:
+    attributes first, then the rest by expected cost
+
+    Costs come from `costs`, the shared `CostModel` by default, then from the
+    latencies in `history`, a dict of `MemberRecord` from a
+    `peepdis.store.MemberStore`, and otherwise from `default_costs` for the
+    member's kind. Ties keep the order of `names`.
+    """
+    costs = costs if costs is not None else cost_model
+    history = history or {}
+
+    def cost(indexed):
+        i, name = indexed
+        kind = classify(obj, name)
+        if kind == "attr":
+            return 0, 0.0, i
+        expected = costs.expected(type_name, name)
+        if expected is None and name in history:
+            expected = history[name].latency
+        if expected is None:
+            expected = default_costs.get(kind, default_costs["method"])
+        return 1, expected, i
+
+    return [name for _, name in sorted(enumerate(names), key=cost)]
@@ -0,0 +1,224 @@
+""" A local record of how each member behaved in earlier sessions
+
+For every type peeped with a store, the arguments that were forged for its
+methods, how long each member took, whether it failed and whether it changed
+the object are kept in an sqlite database under the user cache directory.
+Records are keyed by the type's fully qualified name and the member name, and
+tagged with the version of the package the type comes from, so upgrading a
+library drops what was learned about the old version. Failures are only
+remembered for a while, since they can be transient, like a network error.
+
+Forged arguments are stored pickled, so the database should only be shared
+between users who trust each other, like any other pickle.
+"""
+from collections import namedtuple
+from contextlib import closing
+import os
+import pickle
+import sqlite3
+import sys
+from time import time
+
+# bumped whenever the table changes, which clears existing databases
+schema_version = 1
+# seconds after which a member that failed is evaluated again
+retry_after = 24 * 60 * 60
+
+MemberRecord = namedtuple(
+    "MemberRecord", ["args", "latency", "error", "mutated", "updated"]
+)
+
+_schema = """
+CREATE TABLE IF NOT EXISTS members (
+    type TEXT NOT NULL,
+    member TEXT NOT NULL,
+    version TEXT NOT NULL,
+    args BLOB,
+    latency REAL,
+    error TEXT,
+    mutated INTEGER,
+    updated REAL NOT NULL,
+    PRIMARY KEY (type, member)
+)
+"""
+
+
+def default_path():
+    """ Where the store is kept unless given a path: `$PEEPDIS_CACHE_DIR`, or
+    the platform's user cache directory
+    """
+    directory = os.environ.get("PEEPDIS_CACHE_DIR")
+    if not directory:
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        elif sys.platform == "darwin":
+            base = os.path.expanduser("~/Library/Caches")
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        directory = os.path.join(base, "peepdis")
+    return os.path.join(directory, "store.sqlite3")
+
+
+def type_version(obj):
+    """ Version of the package the type of `obj` comes from, or "" if it
+    doesn't have one
+    """
+    module = obj.__name__ if isinstance(obj, type(sys)) else type(obj).__module__
+    package = (module or "").partition(".")[0]
+    version = getattr(sys.modules.get(package), "__version__", None)
+    if version is None and package not in ("", "__main__", "builtins"):
+        try:
+            from importlib.metadata import version as installed_version
+
+            version = installed_version(package)
+        except Exception:
+            version = None
+    return str(version) if version is not None else ""
+
+
+class MemberStore:
+    """ Records of members by type, in the sqlite database at `path`
+
+    A connection is opened for each read or write, so a store can be shared
+    between threads and processes. Members that failed are skipped until
+    `retry_after` seconds have passed since they last failed.
+    """
+
+    def __init__(self, path=None, retry_after=retry_after):
+        self.path = path if path is not None else default_path()
+        self.retry_after = retry_after
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            with conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != schema_version:
+                    conn.execute("DROP TABLE IF EXISTS members")
+                    conn.execute(f"PRAGMA user_version = {schema_version}")
+                conn.execute(_schema)
+            self._ready = True
+        return closing(conn)
+
+    def load(self, type_name, version):
+        """ Return the records of the members of `type_name` as a dict by
+        member name, discarding any that were made with another version
+        """
+        with self._connect() as conn, conn:
+            conn.execute(
+                "DELETE FROM members WHERE type = ? AND version != ?",
+                (type_name, version),
+            )
+            rows = conn.execute(
+                "SELECT member, args, latency, error, mutated, updated "
+                "FROM members WHERE type = ?",
+                (type_name,),
+            ).fetchall()
+        records = {}
+        for member, args, latency, error, mutated, updated in rows:
+            mutated = None if mutated is None else bool(mutated)
+            records[member] = MemberRecord(
+                _loads(args), latency, error, mutated, updated
+            )
+        return records
+
+    def record(self, type_name, version, records):
+        """ Save `records`, a dict of `MemberRecord` by member name, replacing
+        the earlier records of the same members
+        """
+        if not records:
+            return
+        rows = [
+            (
+                type_name,
+                member,
+                version,
+                _dumps(record.args),
+                record.latency,
+                record.error,
+                None if record.mutated is None else int(record.mutated),
+                record.updated,
+            )
+            for member, record in records.items()
+        ]
+        with self._connect() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def failed_recently(self, record, now=None):
+        """ Whether `record` is of a failure less than `retry_after` seconds
+        old, so its member isn't worth evaluating again yet
+        """
+        if record.error is None:
+            return False
+        now = time() if now is None else now
+        return now - record.updated < self.retry_after
+
+    def forget(self, type_name=None):
+        """ Delete the records of `type_name`, or of every type """
+        with self._connect() as conn, conn:
+            if type_name is None:
+                conn.execute("DELETE FROM members")
+            else:
+                conn.execute("DELETE FROM members WHERE type = ?", (type_name,))
+
+
+def record_output(output, previous=None):
+    """ A `MemberRecord` of what an evaluated `Output` showed, keeping the
+    forged arguments of `previous` if none were forged this time
+    """
+    forged = {}
+    # attributes have no arguments, so don't create an empty `ArgDict` for them
+    if output._args:
+        forged = {
+            name: arg.value
+            for name, arg in output._args.items()
+            if arg.method == "forged"
+        }
+    failed = output.error and not output.args_missing and not output.timed_out
+    if failed or not forged:
+        forged = previous.args if previous is not None and not failed else None
+    mutated = None
+    if output.state_change is not None:
+        mutated = bool(output.state_change)
+    elif previous is not None:
+        mutated = previous.mutated
+    return MemberRecord(
+        forged,
+        output.timings.get("total"),
+        str(output.value) if failed else None,
+        mutated,
+        time(),
+    )
+
+
+def get_store(store):
+    """ The store for the `store` option of `Peeper`: `True` for the one at
+    the default path, `None` or `False` for none, or a `MemberStore`
+    """
+    if store is True:
+        return MemberStore()
+    if store is None or store is False:
+        return None
+    return store
+
+
+def _dumps(args):
+    if args is None:
+        return None
+    try:
+        return pickle.dumps(args)
+    except Exception:
+        return None
+
+
+def _loads(blob):
+    if blob is None:
+        return None
+    try:
+        return pickle.loads(blob)
+    except Exception:
+        return None
@@ -0,0 +1,131 @@
+""" Short summaries of large values, in place of their full repr
+
+Summarizers are registered by the fully qualified name of the type they
+handle, so numpy and pandas are never imported here: a value can only be one
+of their types if they were already imported by whoever made it. Subclasses
+of a registered type, like `numpy.memmap`, use its summarizer.
+"""
+import sys
+
+from peepdis.introspection import registered_for
+
+# values with more elements than this are summarized
+threshold = 1000
+# reductions over more elements than this use an evenly spaced sample
+max_reduced = 10_000_000
+# columns of a DataFrame that are described
+max_columns = 20
+
+
+def summarize(value):
+    """ Return a summary of `value` if it's a large value of a known type,
+    otherwise `None`
+    """
+    summarizer = registered_for(_summarizers, value)
+    if summarizer is None:
+        return None
+    try:
+        return summarizer(value)
+    except Exception:
+        # fall back to the repr rather than fail the whole peep
+        return None
+
+
+def register_summarizer(type_name, func):
+    """ Use `func` to summarize instances of the type named `type_name`, and
+    of its subclasses
+
+    `func` takes the value and returns a string, or `None` to use the repr.
+    """
+    _summarizers[type_name] = func
+
+
+def _memory(n_bytes):
+    if n_bytes < 1024:
+        return f"{n_bytes} B"
+    for unit in ("KiB", "MiB", "GiB"):
+        n_bytes /= 1024
+        if n_bytes < 1024 or unit == "GiB":
+            return f"{n_bytes:.1f} {unit}"
+
+
+def _sample(arr):
+    """ `arr`, or an evenly spaced sample of it if it's too big, without
+    copying it
+    """
+    if arr.size <= max_reduced:
+        return arr, False
+    step = arr.size // max_reduced + 1
+    if arr.flags.c_contiguous:
+        return arr.reshape(-1)[::step], True
+    return arr[::step], True
+
+
+def _summarize_ndarray(arr):
+    if arr.size <= threshold:
+        return None
+    np = sys.modules["numpy"]
+    parts = [
+        f"{type(arr).__name__} shape={arr.shape}",
+        f"dtype={arr.dtype}",
+        f"memory={_memory(arr.nbytes)}",
+    ]
+    if arr.dtype.kind in "iuf":
+        values, sampled = _sample(arr)
+        if arr.dtype.kind == "f":
+            nans = int(np.count_nonzero(np.isnan(values)))
+            parts.append(f"nan={nans}")
+        if values.size and (arr.dtype.kind != "f" or nans < values.size):
+            parts.append(
+                f"min={np.nanmin(values):.6g} max={np.nanmax(values):.6g} "
+                f"mean={np.nanmean(values):.6g}"
+            )
+        if sampled:
+            parts.append(f"(stats from {values.size} sampled elements)")
+    return " ".join(parts)
+
+
+def _summarize_dataframe(df):
+    if df.size <= threshold:
+        return None
+    memory = int(df.memory_usage(index=True, deep=False).sum())
+    lines = [f"DataFrame shape={df.shape} memory={_memory(memory)}"]
+    columns = df.iloc[:, :max_columns]
+    nulls = columns.isna().sum()
+    numeric = columns.select_dtypes("number")
+    stats = numeric.agg(["min", "max", "mean"]) if len(numeric.columns) else None
+    for name in columns.columns:
+        line = f"  {name}: {columns[name].dtype} nulls={int(nulls[name])}"
+        if stats is not None and name in stats.columns:
+            column = stats[name]
+            line += (
+                f" min={column['min']:.6g} max={column['max']:.6g} "
+                f"mean={column['mean']:.6g}"
+            )
+        lines.append(line)
+    if df.shape[1] > max_columns:
+        lines.append(f"  ... {df.shape[1] - max_columns} more columns")
+    return "\n".join(lines)
+
+
+def _summarize_series(series):
+    if series.size <= threshold:
+        return None
+    memory = int(series.memory_usage(index=True, deep=False))
+    line = (
+        f"Series name={series.name!r} length={len(series)} dtype={series.dtype} "
+        f"memory={_memory(memory)} nulls={int(series.isna().sum())}"
+    )
+    if series.dtype.kind in "iuf":
+        line += (
+            f" min={series.min():.6g} max={series.max():.6g} "
+            f"mean={series.mean():.6g}"
+        )
+    return line
+
+
+_summarizers = {
+    "numpy.ndarray": _summarize_ndarray,
+    "pandas.DataFrame": _summarize_dataframe,
+    "pandas.Series": _summarize_series,
+}
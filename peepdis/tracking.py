@@ -0,0 +1,208 @@
+""" Tracking how calling a method changes the state of its object
+
+The attributes of the object are fingerprinted before and after the call
+(see `peepdis.fingerprint`), and a description of the change is only built
+for the attributes whose fingerprint differs. Fingerprints of nested mutable
+objects only change when they're replaced, so when there's an unmodified
+reference to compare with, those attributes are also compared with it.
+"""
+import sys
+
+from peepdis.fingerprint import (
+    _find_fingerprinter,
+    attribute_fingerprints,
+    is_exact,
+    value_fingerprint,
+)
+from peepdis.introspection import instance_attributes, registered_for
+from peepdis.rendering import shorten
+
+_missing = object()
+
+
+class StateChange:
+    """ Attributes added, removed or modified by a call, each mapped to a
+    short description of the change
+    """
+
+    def __init__(self, added=None, removed=None, modified=None):
+        self.added = added if added else {}
+        self.removed = removed if removed else {}
+        self.modified = modified if modified else {}
+
+    def render(self):
+        changes = [f"{name}: {change}" for name, change in self.modified.items()]
+        changes += [f"+{name}: {value}" for name, value in self.added.items()]
+        changes += [f"-{name}" for name in self.removed]
+        return "; ".join(changes)
+
+    def to_dict(self):
+        return {
+            "added": dict(self.added),
+            "removed": dict(self.removed),
+            "modified": dict(self.modified),
+        }
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return f"StateChange({self.render()})"
+
+
+def snapshot(obj):
+    """ Fingerprints of the attributes of `obj`, to compare with after a call """
+    return attribute_fingerprints(obj)
+
+
+def state_change(before, obj, reference=None):
+    """ Return the `StateChange` of `obj` since the `snapshot` `before`
+
+    `reference` is an unmodified equivalent of `obj`, like the object it was
+    copied from, used to describe what modified attributes used to be.
+    Returns `None` if the state of `obj` can't be fingerprinted.
+    """
+    after = attribute_fingerprints(obj)
+    if before is None or after is None:
+        return None
+    # iterated in attribute order, so changes are always listed the same way
+    added = {
+        name: _short_repr(getattr(obj, name, None))
+        for name in after
+        if name not in before
+    }
+    removed = {
+        name: _short_repr(getattr(reference, name, None))
+        for name in before
+        if name not in after
+    }
+    modified = {}
+    for name in after:
+        if name not in before:
+            continue
+        old = getattr(reference, name, _missing) if reference is not None else _missing
+        new = getattr(obj, name, None)
+        if before[name] == after[name] and (
+            old is _missing or is_exact(new) or same_state(old, new)
+        ):
+            continue
+        modified[name] = describe_change(old, new)
+    return StateChange(added, removed, modified)
+
+
+def same_state(a, b, depth=8):
+    """ Whether `a` and `b`, like an object and its deep copy, hold the same
+    state, looking up to `depth` levels into containers and attributes
+
+    Objects that compare by identity are compared by their attributes
+    instead. Values that can't be compared are taken to be the same.
+    """
+    if type(a) is not type(b):
+        return False
+    if depth == 0:
+        return True
+    if _find_fingerprinter(a) is not None:
+        return value_fingerprint(a) == value_fingerprint(b)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(
+            same_state(x, y, depth - 1) for x, y in zip(a, b)
+        )
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(
+            same_state(a[key], b[key], depth - 1) for key in a
+        )
+    if type(a).__eq__ is object.__eq__:
+        a_attrs, b_attrs = instance_attributes(a), instance_attributes(b)
+        if a_attrs is None or b_attrs is None:
+            return True
+        return a_attrs.keys() == b_attrs.keys() and all(
+            same_state(a_attrs[name], b_attrs[name], depth - 1) for name in a_attrs
+        )
+    try:
+        return bool(a == b)
+    except Exception:
+        return True
+
+
+def describe_change(before, after, max_len=60):
+    """ Short description of how `before` changed into `after` """
+    if before is _missing:
+        return f"now {_short_repr(after, max_len)}"
+    if type(before) is type(after):
+        describer = registered_for(_describers, after)
+        if describer is None:
+            for type_, func in _builtin_describers:
+                if isinstance(after, type_):
+                    describer = func
+                    break
+        if describer is not None:
+            try:
+                return describer(before, after)
+            except Exception:
+                # fall back to the reprs when values can't be compared
+                pass
+    return f"{_short_repr(before, max_len)} -> {_short_repr(after, max_len)}"
+
+
+def _short_repr(value, max_len=60):
+    try:
+        return shorten(repr(value), max_len=max_len)
+    except Exception as e:
+        return f"(repr raised {e!r})"
+
+
+def _describe_ndarray(before, after):
+    if before.shape != after.shape:
+        return f"shape {before.shape} -> {after.shape}"
+    if before.dtype != after.dtype:
+        return f"dtype {before.dtype} -> {after.dtype}"
+    np = sys.modules["numpy"]
+    # counted in one vectorized pass, with NaNs in the same place left equal
+    changed = np.count_nonzero(
+        (before != after) & ~(np.isnan(before) & np.isnan(after))
+        if before.dtype.kind in "fc"
+        else before != after
+    )
+    return f"{changed} of {after.size} elements changed"
+
+
+def _describe_pandas(before, after):
+    if before.shape != after.shape:
+        return f"shape {before.shape} -> {after.shape}"
+    pd = sys.modules["pandas"]
+    before_hashes = pd.util.hash_pandas_object(before, index=True).values
+    after_hashes = pd.util.hash_pandas_object(after, index=True).values
+    changed = int((before_hashes != after_hashes).sum())
+    return f"{changed} of {len(after)} rows changed"
+
+
+def _describe_sequence(before, after):
+    if len(before) != len(after):
+        return f"length {len(before)} -> {len(after)}"
+    changed = sum(1 for old, new in zip(before, after) if old != new)
+    return f"{changed} of {len(after)} items changed"
+
+
+def _describe_dict(before, after):
+    added = len(after.keys() - before.keys())
+    removed = len(before.keys() - after.keys())
+    changed = sum(
+        1 for key in before.keys() & after.keys() if before[key] != after[key]
+    )
+    return f"{added} keys added, {removed} removed, {changed} changed"
+
+
+def _describe_set(before, after):
+    return f"{len(after - before)} added, {len(before - after)} removed"
+
+
+_describers = {
+    "numpy.ndarray": _describe_ndarray,
+    "pandas.DataFrame": _describe_pandas,
+    "pandas.Series": _describe_pandas,
+}
+_builtin_describers = (
+    ((list, tuple), _describe_sequence),
+    (dict, _describe_dict),
+    ((set, frozenset), _describe_set),
+)
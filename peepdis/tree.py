@@ -0,0 +1,271 @@
+""" Searching the graph of objects reachable through attributes
+
+Only data already stored on objects is followed: attributes in `__dict__` or
+`__slots__`, dict values, and list and tuple items. Nothing is called, so no
+method or property runs during a walk.
+"""
+from collections import deque
+import re
+import reprlib
+import sys
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+from peepdis.introspection import _is_private, instance_attributes, registered_for
+from peepdis.rendering import LineBuffer, colorize
+
+_leaves = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    bytearray,
+    range,
+    type,
+    ModuleType,
+    FunctionType,
+    MethodType,
+    BuiltinFunctionType,
+)
+# values with attributes of their own that are computed rather than stored,
+# along with their subclasses
+_opaque_types = dict.fromkeys(
+    ("numpy.ndarray", "pandas.DataFrame", "pandas.Series"), True
+)
+
+
+class Node:
+    """ An object found during a walk, and how it was reached """
+
+    __slots__ = ("parent", "key", "value", "depth", "item")
+
+    def __init__(self, parent, key, value, depth, item=False):
+        self.parent = parent
+        self.key = key
+        self.value = value
+        self.depth = depth
+        # reached by indexing, rather than as an attribute
+        self.item = item
+
+    @property
+    def path(self):
+        # built from the parent links only when needed, so a walk of many
+        # nodes doesn't hold a string for each of them
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(f"[{node.key!r}]" if node.item else f".{node.key}")
+            node = node.parent
+        parts.append(node.key)
+        return "".join(reversed(parts))
+
+    def __repr__(self):
+        return f"Node({self.path})"
+
+
+def walk(obj, depth=3, privates=False, name="obj"):
+    """ Yield a `Node` for each object reachable from `obj`, breadth-first
+
+    Objects already reached are skipped by `id`, which avoids cycles. The
+    children of a node are only found once the node has been yielded, so
+    stopping early never touches the rest of the graph.
+    """
+    root = Node(None, name, obj, 0)
+    seen = {id(obj)}
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        yield node
+        if node.depth >= depth:
+            continue
+        for key, value, item in _children(node.value, privates):
+            if not isinstance(value, _leaves):
+                # immutables are shared freely, so only track the rest
+                if id(value) in seen:
+                    continue
+                seen.add(id(value))
+            queue.append(Node(node, key, value, node.depth + 1, item))
+
+
+def _children(value, privates):
+    if isinstance(value, _leaves) or registered_for(_opaque_types, value):
+        return ()
+    if isinstance(value, dict):
+        return ((key, item, True) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ((i, item, True) for i, item in enumerate(value))
+    attrs = instance_attributes(value)
+    if not attrs:
+        return ()
+    return (
+        (key, attr, False)
+        for key, attr in attrs.items()
+        if privates or not _is_private(key)
+    )
+
+
+class TreeResult:
+    """ Nodes matched by `peep_tree`, with how much of the graph was seen """
+
+    def __init__(self, matches, visited, stopped=None):
+        self.matches = matches
+        self.visited = visited
+        # the budget that ended the walk early, if any
+        self.stopped = stopped
+
+    def lines(self):
+        lines = [_render_node(node) for node in self.matches]
+        summary = f"({len(self.matches)} matches in {self.visited} nodes"
+        if self.stopped:
+            summary += f", stopped at {self.stopped} budget"
+        lines.append(colorize(summary + ")", "grey"))
+        return lines
+
+    def __repr__(self):
+        buffer = LineBuffer()
+        for line in self.lines():
+            buffer.add(line)
+        return buffer.getvalue()
+
+    def __str__(self):
+        return repr(self)
+
+    def __iter__(self):
+        return iter(self.matches)
+
+    def __len__(self):
+        return len(self.matches)
+
+
+_repr = reprlib.Repr()
+_repr.maxstring = 80
+_repr.maxother = 80
+
+
+def _render_node(node):
+    type_name = type(node.value).__name__
+    return (
+        f"{colorize(node.path, 'cyan')} {colorize(f'({type_name})', 'grey')}: "
+        f"{_repr.repr(node.value)}"
+    )
+
+
+def peep_tree(
+    obj,
+    depth=3,
+    where=None,
+    first=False,
+    max_nodes=100_000,
+    max_bytes=None,
+    privates=False,
+    name="obj",
+):
+    """ Walk the objects reachable from `obj` breadth-first, up to `depth`
+    attributes or items deep, collecting those that satisfy `where`
+
+    `where` is called with each `Node`, and every node is collected if it's
+    `None`. See `name_matches`, `is_type`, `has_dtype` and `contains` for
+    ready-made predicates, which combine with `&`, `|` and `~`. With
+    `first`, the walk stops at the first match.
+
+    The walk also stops after `max_nodes` nodes, or once the shallow size of
+    the objects reached adds up to `max_bytes`.
+    """
+    matches = []
+    visited = 0
+    size = 0
+    stopped = None
+    for node in walk(obj, depth, privates, name):
+        if visited >= max_nodes:
+            stopped = "node"
+            break
+        visited += 1
+        if max_bytes is not None:
+            size += _sizeof(node.value)
+            if size > max_bytes:
+                stopped = "memory"
+                break
+        if where is None or where(node):
+            matches.append(node)
+            if first:
+                break
+    return TreeResult(matches, visited, stopped)
+
+
+def _sizeof(value):
+    try:
+        return sys.getsizeof(value)
+    except Exception:
+        return 0
+
+
+class Predicate:
+    """ A test of a `Node`, which can be combined with `&`, `|` and `~` """
+
+    def __init__(self, func, description=""):
+        self.func = func
+        self.description = description
+
+    def __call__(self, node):
+        try:
+            return bool(self.func(node))
+        except Exception:
+            return False
+
+    def __and__(self, other):
+        return Predicate(
+            lambda node: self(node) and other(node), f"({self} & {other})"
+        )
+
+    def __or__(self, other):
+        return Predicate(
+            lambda node: self(node) or other(node), f"({self} | {other})"
+        )
+
+    def __invert__(self):
+        return Predicate(lambda node: not self(node), f"~{self}")
+
+    def __str__(self):
+        return self.description
+
+    def __repr__(self):
+        return f"Predicate({self.description})"
+
+
+def name_matches(pattern):
+    """ Nodes whose attribute name or key matches the regex `pattern` """
+    regex = re.compile(pattern)
+    return Predicate(
+        lambda node: regex.search(str(node.key)), f"name_matches({pattern!r})"
+    )
+
+
+def is_type(*types):
+    """ Nodes whose value is an instance of any of `types` """
+    return Predicate(lambda node: isinstance(node.value, types), f"is_type{types}")
+
+
+def has_dtype(dtype):
+    """ Nodes with a numpy or pandas `dtype` of `dtype`, or any column of it """
+
+    def test(node):
+        dtypes = getattr(node.value, "dtypes", None)
+        if dtypes is not None and hasattr(dtypes, "__iter__"):
+            return any(str(d) == str(dtype) for d in dtypes)
+        return str(getattr(node.value, "dtype", None)) == str(dtype)
+
+    return Predicate(test, f"has_dtype({dtype!r})")
+
+
+def contains(x):
+    """ Nodes whose value contains `x`, like a substring or a list item """
+
+    def test(node):
+        # without `__contains__`, `in` would iterate, which can consume it
+        if not hasattr(type(node.value), "__contains__"):
+            return False
+        return x in node.value
+
+    return Predicate(test, f"contains({x!r})")
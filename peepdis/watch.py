@@ -0,0 +1,178 @@
+import re
+import sys
+
+from peepdis.core import Peeper
+from peepdis.datastructures import Output, _builtin_names
+from peepdis.fingerprint import attribute_fingerprints
+from peepdis.introspection import classify, member_dependencies, member_names
+from peepdis.rendering import LineBuffer, colorize_as
+
+
+def watch(obj, verbose=False, isolation="deepcopy", **kwargs):
+    """ Print the members of `obj` and return a `Watcher` for it, whose
+    `refresh` prints only what has changed since
+
+    Options for evaluating members, like `timeout` or `properties`, are
+    passed on to `Peeper.evaluate`.
+    """
+    watcher = Watcher(obj, verbose=verbose, isolation=isolation, **kwargs)
+    watcher.refresh(quiet=True)
+    watcher.print(verbose)
+    return watcher
+
+
+class Changes:
+    """ Members added, removed or modified between two peeps
+
+    `modified` maps each name to its previous and new `Output`.
+    """
+
+    def __init__(self):
+        self.added = {}
+        self.removed = {}
+        self.modified = {}
+
+    def lines(self, verbose=False):
+        lines = []
+        for marker, outputs in (("added", self.added), ("removed", self.removed)):
+            for name, output in sorted(outputs.items()):
+                if verbose or not output.builtin:
+                    lines.append(_marked(marker, output.render()))
+        for name, (old, new) in sorted(self.modified.items()):
+            if verbose or not new.builtin:
+                was = colorize_as(f"(was: {old.value})", "null")
+                lines.append(_marked("modified", f"{new.render()} {was}"))
+        return lines
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return "\n".join(self.lines(verbose=True))
+
+
+_markers = {"added": "+", "removed": "-", "modified": "~"}
+# default reprs name the addresses of objects, which differ between the copies
+# made on each refresh
+_address = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _marked(change, line):
+    return f"{colorize_as(_markers[change], change)} {line}"
+
+
+class Watcher(Peeper):
+    """ Keeps the last peep of an object and updates it on `refresh`
+
+    Only members whose inputs may have changed are evaluated again: those
+    set on the object whose fingerprint changed, and methods and properties
+    whose code reads them. Changes are detected with the shallow fingerprint
+    of `peepdis.fingerprint`, so methods depending on anything other than the
+    object's own attributes, like globals or nested state, may be missed.
+    Fingerprinting hashes array and DataFrame attributes in full, so each
+    refresh takes time in proportion to the size of the object's data.
+
+    Stale attributes are read from the object itself, and it's only copied
+    again when a stale method or property has to be evaluated.
+
+    Builtins are only watched if `verbose`, and differences in output that
+    only come from the identity of the copy evaluated, like the address in a
+    default `__repr__`, aren't reported.
+    """
+
+    def __init__(self, obj, verbose=False, isolation="deepcopy", **kwargs):
+        super().__init__(obj, isolation=isolation)
+        self.source = obj
+        self.verbose = verbose
+        self.options = kwargs
+        self.state = None
+        self.refreshes = 0
+
+    def refresh(self, quiet=False) -> Changes:
+        """ Re-evaluate the members that may have changed, printing and
+        returning the differences
+        """
+        state = attribute_fingerprints(self.source)
+        names = set(member_names(self.source))
+        changes = Changes()
+        for name in self.dir - names:
+            if name in self:
+                changes.removed[name] = self[name]
+            self._unindex(name)
+        # builtins can't be traced to the attributes they read, so they'd be
+        # evaluated again on every change
+        watched = names if self.verbose else names - _builtin_names()
+        stale = watched - set(self)
+        if state is None:
+            # nothing to compare, so anything could have changed
+            stale = watched
+        elif state != self.state and self.state is not None:
+            stale |= self._affected(watched, self._changed_attrs(state))
+        plain = {name for name in stale if classify(self.source, name) == "attr"}
+        if stale - plain and self.refreshes:
+            # the copy made when the watcher was created is out of date
+            self.obj = self._isolate(self.source)
+        for name in sorted(stale):
+            if name in plain:
+                output = self._read(name)
+            else:
+                output = self.evaluate(name, **self.options)
+            previous = self.get(name)
+            # index first so that both outputs are compared as they're stored,
+            # released or not
+            self._index(output)
+            if previous is None:
+                changes.added[name] = output
+            elif self._modified(previous, output):
+                changes.modified[name] = (previous, output)
+        self.dir = names
+        self.state = state
+        self.refreshes += 1
+        if changes and not quiet:
+            buffer = LineBuffer()
+            for line in changes.lines(self.verbose):
+                buffer.add(line)
+            buffer.write(sys.stdout)
+        return changes
+
+    def _read(self, name) -> Output:
+        """ The `Output` of the plain attribute `name`, read from the source
+        rather than from a fresh copy of the whole object
+        """
+        try:
+            value = getattr(self.source, name)
+        except Exception as e:
+            return Output(name, repr(e), error=True)
+        if self.keep_values:
+            # otherwise it's rendered as it's indexed, before the source changes
+            value = self._isolate(value)
+        return Output(name, value)
+
+    def _modified(self, previous, output):
+        """ Whether `output` differs from `previous` other than by the identity
+        of the copies they were evaluated on
+        """
+        if output.name == "__hash__" and type(self.source).__hash__ is object.__hash__:
+            return False
+        return _address.sub("", previous.render()) != _address.sub(
+            "", output.render()
+        )
+
+    def _changed_attrs(self, state):
+        return {
+            name
+            for name in state.keys() | self.state.keys()
+            if state.get(name) != self.state.get(name)
+        }
+
+    def _affected(self, names, changed):
+        """ Names of the members that read any of the `changed` attributes """
+        affected = set(changed) & names
+        for name in names - affected:
+            output: Output = self.get(name)
+            if output is None or not (output.callable_ or output.property_):
+                continue
+            dependencies = member_dependencies(self.source, name)
+            if dependencies is None or dependencies & changed:
+                affected.add(name)
+        return affected
@@ -10,6 +10,7 @@ setup(
     url='https://github.com/TheAustinator/peep-dis',
     license=license,
     packages=find_packages(exclude=('tests', 'docs')),
+    python_requires='>=3.8',
     install_requires=['termcolor'],
     setup_requires=['termcolor'],
     classifiers=[
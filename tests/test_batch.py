@@ -0,0 +1,62 @@
+import pytest
+
+from peepdis.batch import Failed, peep_many, zero_arg_members
+
+
+class Reading:
+    def __init__(self, city, temp):
+        self.city = city
+        self.temp = temp
+
+    def fahrenheit(self):
+        return self.temp * 9 / 5 + 32
+
+    def ratio(self):
+        return 10 / self.temp
+
+    def scaled(self, factor):
+        return self.temp * factor
+
+    @property
+    def label(self):
+        return f"{self.city}: {self.temp}"
+
+
+readings = [Reading("sf", 10), Reading("la", 20), Reading("sf", 0)]
+
+
+def test_zero_arg_members():
+    assert zero_arg_members(readings[0]) == ["city", "fahrenheit", "ratio", "temp"]
+    assert "label" in zero_arg_members(readings[0], properties=True)
+
+
+@pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+def test_peep_many(executor):
+    table = peep_many(readings, executor=executor, workers=2)
+    assert len(table) == 3
+    assert table["fahrenheit"] == [50.0, 68.0, 32.0]
+    assert table["city"] == ["sf", "la", "sf"]
+    assert isinstance(table["ratio"][2], Failed)
+    assert "fahrenheit" in repr(table)
+
+
+def test_members():
+    table = peep_many(readings, members=["temp", "label"])
+    assert table["label"] == ["sf: 10", "la: 20", "sf: 0"]
+
+
+def test_describe():
+    stats = peep_many(readings).describe()
+    assert stats.index[0] == "count"
+    summary = dict(zip(stats.index, stats["temp"]))
+    assert summary["mean"] == 10
+    assert summary["min"] == 0
+    summary = dict(zip(stats.index, stats["ratio"]))
+    assert summary["errors"] == 1
+    summary = dict(zip(stats.index, stats["city"]))
+    assert summary["unique"] == 2
+    assert summary["top"] == "sf"
+
+
+def test_empty():
+    assert len(peep_many([])) == 0
@@ -0,0 +1,133 @@
+import gc
+
+import pytest
+
+from peepdis import legacy
+from peepdis.caching import ResultCache
+from peepdis.core import Peeper
+from peepdis.fingerprint import fingerprint, register_fingerprinter
+
+
+class Counter:
+    def __init__(self):
+        self.n = 0
+        self.history = []
+
+    def total(self):
+        Counter.calls += 1
+        return self.n
+
+
+Counter.calls = 0
+
+
+class Slotted:
+    __slots__ = ("a",)
+
+    def __init__(self, a):
+        self.a = a
+
+
+def test_fingerprint_changes_with_state():
+    counter = Counter()
+    before = fingerprint(counter)
+    assert fingerprint(counter) == before
+    counter.n = 1
+    assert fingerprint(counter) != before
+    after = fingerprint(counter)
+    counter.history.append(1)
+    assert fingerprint(counter) != after
+
+
+def test_fingerprint_slots():
+    slotted = Slotted(1)
+    before = fingerprint(slotted)
+    slotted.a = 2
+    assert fingerprint(slotted) != before
+
+
+def test_fingerprint_unsupported():
+    assert fingerprint(object()) is None
+
+
+def test_failing_fingerprinter_not_cacheable():
+    class Opaque:
+        pass
+
+    register_fingerprinter(f"{__name__}.{Opaque.__qualname__}", lambda value: 1 / 0)
+    counter = Counter()
+    counter.opaque = Opaque()
+    assert fingerprint(Opaque()) is None
+    assert fingerprint(counter) is None
+    cache = ResultCache()
+    cache.put(counter, (), "result")
+    assert len(cache) == 0
+    peeper = Peeper(counter)
+    peeper.peep(track=True)
+    assert peeper["total"].value == "0"
+
+
+def test_fingerprint_numpy_subclasses_and_objects(tmp_path):
+    np = pytest.importorskip("numpy")
+    memmap = np.memmap(tmp_path / "values", dtype="int64", mode="w+", shape=(4,))
+    before = fingerprint(memmap)
+    memmap[0] = 7
+    assert fingerprint(memmap) != before
+    assert fingerprint(np.array([1, None, "x"], dtype=object)) is None
+
+
+def test_fingerprint_pandas():
+    pd = pytest.importorskip("pandas")
+    counter = Counter()
+    counter.df = pd.DataFrame({"a": [1, 2]})
+    before = fingerprint(counter)
+    counter.df.loc[0, "a"] = 5
+    assert fingerprint(counter) != before
+    counter.df["b"] = [[1], [2]]
+    assert fingerprint(counter) is None
+    legacy.peep(counter, cache=True)
+
+
+def test_cache_hit_and_invalidation():
+    cache = ResultCache()
+    counter = Counter()
+    cache.put(counter, (), "result")
+    assert cache.get(counter, ()) == "result"
+    assert cache.get(counter, ("other options",)) is None
+    counter.n = 5
+    assert cache.get(counter, ()) is None
+    assert len(cache) == 0
+
+
+def test_cache_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    counters = [Counter() for _ in range(3)]
+    for i, counter in enumerate(counters):
+        cache.put(counter, (), i)
+    assert len(cache) == 2
+    assert cache.get(counters[0], ()) is None
+    assert cache.get(counters[2], ()) == 2
+
+
+def test_cache_drops_collected_objects():
+    cache = ResultCache()
+    counter = Counter()
+    cache.put(counter, (), "result")
+    del counter
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_peep_cache():
+    cache = ResultCache()
+    counter = Counter()
+    Counter.calls = 0
+    first = legacy.peep(counter, cache=cache)
+    assert Counter.calls == 1
+    second = legacy.peep(counter, cache=cache)
+    assert Counter.calls == 1
+    assert str(second) == str(first)
+    counter.n = 3
+    third = legacy.peep(counter, cache=cache)
+    assert Counter.calls == 2
+    assert "total(): 3" in str(third)
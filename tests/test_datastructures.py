@@ -1,4 +1,13 @@
-from peepdis.datastructures import Arg, ArgDict, Output
+from datetime import date
+import gc
+from inspect import signature
+from pathlib import PurePosixPath
+import weakref
+
+import pytest
+
+from peepdis.core import Peeper
+from peepdis.datastructures import Arg, ArgDict, Output, OutputIndex
 
 
 class TestArg:
@@ -12,9 +21,128 @@ class TestArg:
         pass
 
 
+def call(a, b, /, c, d=4, *args, e, f=6, **kwargs):
+    return a, b, c, d, args, e, f, kwargs
+
+
 class TestArgDict:
-    pass
+    def test_from_signature(self):
+        args = ArgDict.from_signature(signature(call))
+        assert list(args) == ["a", "b", "c", "d", "e", "f"]
+        assert args[3] is args["d"]
+        assert args["d"].method == "default"
+        assert args.missing_positional == ("a", "b", "c")
+        assert args.null_args == ("a", "b", "c", "e")
+
+    def test_bind(self):
+        args = ArgDict.from_signature(signature(call))
+        args.bind(1, 2, 3, 5, 7, 8, e=9, a=10, g=11)
+        assert [args[i].value for i in range(4)] == [1, 2, 3, 5]
+        assert args["e"].method == "specified"
+        call_args, call_kwargs = args.call_arguments()
+        assert call_args == (1, 2, 3, 5, 7, 8)
+        assert call_kwargs == {"e": 9, "a": 10, "g": 11}
+        expected = (1, 2, 3, 5, (7, 8), 9, 6, {"a": 10, "g": 11})
+        assert call(*call_args, **call_kwargs) == expected
+        assert str(list(args._shown())[4]).startswith("*args")
+
+    def test_defaults_passed_by_keyword_after_gap(self):
+        args = ArgDict.from_signature(signature(call))
+        args.bind(1, 2, e=5)
+        args["c"].value, args["c"].method = 3, "forged"
+        assert args.call_arguments() == ((1, 2, 3), {"e": 5})
+        args = ArgDict.from_signature(signature(lambda a=1, b=2: None)).bind(b=3)
+        assert args.call_arguments() == ((), {"b": 3})
+
+    def test_bind_errors(self):
+        args = ArgDict.from_signature(signature(lambda a: None))
+        with pytest.raises(TypeError):
+            args.bind(1, 2)
+        with pytest.raises(TypeError):
+            args.bind(b=1)
+
+    def test_update_kwargs(self):
+        args = ArgDict(["self", "a", "b"])
+        args.update_kwargs(b=2)
+        args.update_positional(1)
+        assert args == {"a": 1, "b": 2}
+
+    def test_setitem_by_position(self):
+        args = ArgDict(["a", "b"])
+        args[1] = Arg("b", 5)
+        assert args["b"].value == 5
+        assert args[1] is args["b"]
+
+
+class Payload:
+    def __repr__(self):
+        return "Payload()"
+
+
+class Holder:
+    def __init__(self):
+        self.payload = Payload()
+        self.n = 1
+
+    def double(self):
+        return self.n * 2
 
 
 class TestOutput:
-    pass
+    def test_slots(self):
+        output = Output("a", 1)
+        assert not hasattr(output, "__dict__")
+        assert not hasattr(Arg("a"), "__dict__")
+
+    def test_release_keeps_small_values(self):
+        output = Output("a", 1)
+        output.release()
+        assert output.value == 1
+        assert not output.released
+
+    def test_release_renders_large_values(self):
+        output = Output("a", list(range(10_000)), ArgDict(["x"]))
+        output.args["x"].value = {"k": list(range(10_000))}
+        output.release(max_len=50)
+        assert output.released
+        assert output.value.startswith("[0, 1, 2")
+        assert len(output.value) <= 54
+        assert len(output.args["x"].value) <= 54
+        assert output.to_dict(max_len=10)["value"] == "[0, 1, 2,  ..."
+
+    def test_release_renders_like_str(self):
+        values = [date(2020, 1, 2), PurePosixPath("/tmp/x"), list(range(60))]
+        for value in values:
+            output = Output("a", value)
+            rendered = output.render()
+            output.release()
+            assert output.value == str(value)
+            assert output.render() == rendered
+
+
+class TestPeeperStore:
+    def test_values_not_retained(self):
+        holder = Holder()
+        peeper = Peeper(holder)
+        peeper.peep()
+        payload = weakref.ref(peeper.obj.payload)
+        del peeper.obj
+        gc.collect()
+        assert payload() is None
+        assert peeper.attrs["payload"] == "Payload()"
+        assert peeper.attrs["n"] == 1
+
+    def test_keep_values(self):
+        peeper = Peeper(Holder(), keep_values=True)
+        peeper.peep()
+        assert isinstance(peeper.attrs["payload"], Payload)
+
+    def test_categories_index_one_store(self):
+        peeper = Peeper(Holder())
+        peeper.peep()
+        assert isinstance(peeper.methods, OutputIndex)
+        assert peeper.methods["double"] == "2"
+        assert "double" not in peeper.attrs
+        assert dict(peeper.attrs) == {"n": 1, "payload": "Payload()"}
+        peeper._unindex("double")
+        assert "double" not in peeper.methods
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from peepdis.execution import (
+    EvaluationTimeout,
+    InlineExecutor,
+    call_in_fork,
+    call_with_timeout,
+    check_isolation,
+    open_executor,
+)
+
+
+class TestCallWithTimeout:
+    def test_no_timeout(self):
+        assert call_with_timeout(lambda x: x + 1, 1) == 2
+
+    def test_within_budget(self):
+        assert call_with_timeout(lambda: 5, timeout=1) == 5
+
+    def test_exceeds_budget(self):
+        start = time.perf_counter()
+        with pytest.raises(EvaluationTimeout):
+            call_with_timeout(time.sleep, 1, timeout=0.05)
+        assert time.perf_counter() - start < 0.5
+
+    def test_reraises(self):
+        with pytest.raises(ZeroDivisionError):
+            call_with_timeout(lambda: 1 / 0, timeout=1)
+
+
+class TestOpenExecutor:
+    @pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+    def test_map_order(self, executor):
+        with open_executor(executor, workers=2) as pool:
+            assert list(pool.map(abs, [-3, 1, -2])) == [3, 1, 2]
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            with open_executor("cluster"):
+                pass
+
+    def test_existing_executor_left_running(self):
+        executor = InlineExecutor()
+        with open_executor(executor) as pool:
+            assert pool is executor
+        assert executor.submit(abs, -1).result() == 1
+
+    def test_unpicklable_object_raises(self):
+        # run in a subprocess so that a hung process pool fails the test rather
+        # than the whole run
+        # workers started by forking inherit the object rather than unpickling
+        # it, so spawn them
+        script = textwrap.dedent(
+            """
+            import json
+            import multiprocessing
+
+            from peepdis import legacy
+
+            multiprocessing.set_start_method("spawn")
+            try:
+                legacy.peep(json, executor="process")
+            except TypeError:
+                print("raised")
+            """
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        assert result.stdout.strip().endswith("raised")
+
+    def test_object_pickled_once_per_worker(self, tmp_path):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = tmp_path / "pickles.py"
+        script.write_text(
+            textwrap.dedent(
+                """
+                import multiprocessing
+
+                from peepdis import legacy
+
+                pickles = 0
+
+
+                class Wide:
+                    def __reduce__(self):
+                        global pickles
+                        pickles += 1
+                        return Wide, ()
+
+                    def __deepcopy__(self, memo):
+                        return Wide()
+
+
+                for i in range(20):
+                    setattr(Wide, f"m{i}", lambda self, i=i: i)
+
+                if __name__ == "__main__":
+                    multiprocessing.set_start_method("spawn")
+                    legacy.peep(Wide(), executor="process", workers=2)
+                    print(pickles)
+                """
+            )
+        )
+        result = subprocess.run(
+            [sys.executable, str(script)],
+            env={**os.environ, "PYTHONPATH": root},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        assert 1 <= int(result.stdout.strip()) <= 2
+
+
+class TestCallInFork:
+    def test_result(self):
+        assert call_in_fork(lambda x: x * 2, 4) == 8
+
+    def test_reraises(self):
+        with pytest.raises(ZeroDivisionError):
+            call_in_fork(lambda: 1 / 0)
+
+    def test_mutation_not_visible(self):
+        state = [1, 2, 3]
+        assert call_in_fork(state.pop) == 3
+        assert state == [1, 2, 3]
+
+    def test_unpicklable_result(self):
+        with pytest.raises(Exception):
+            call_in_fork(lambda: (lambda: None))
+
+    def test_check_isolation(self):
+        check_isolation("fork")
+        with pytest.raises(ValueError):
+            check_isolation("sandbox")
+
@@ -0,0 +1,53 @@
+import io
+import json
+
+from peepdis.core import iter_peep
+from peepdis.export import export, read_columnar, write_columnar, write_jsonl
+
+
+class Square:
+    def __init__(self, a):
+        self.a = a
+        self.big = list(range(10_000))
+
+    def area(self):
+        return self.a ** 2
+
+    def resize(self, a):
+        self.a = a
+
+
+def test_jsonl():
+    file = io.StringIO()
+    count = write_jsonl(iter_peep(Square(3)), file)
+    records = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert len(records) == count
+    by_name = {record["name"]: record for record in records}
+    assert by_name["area"]["value"] == "9"
+    assert by_name["area"]["kind"] == "callable_"
+    assert by_name["a"]["value"] == "3"
+    assert by_name["resize"]["output_type"] == "null"
+    assert list(by_name["resize"]["args"]) == ["a"]
+    assert "total" in by_name["area"]["timings"]
+    assert len(by_name["big"]["value"]) < 300
+
+
+def test_columnar():
+    file = io.StringIO()
+    count = write_columnar(iter_peep(Square(3)), file, chunk_size=10)
+    lines = file.getvalue().splitlines()
+    assert len(lines) == -(-count // 10)
+    assert len(json.loads(lines[0])["name"]) == 10
+    file.seek(0)
+    records = list(read_columnar(file))
+    assert len(records) == count
+    assert {"name": "area", "value": "9"}.items() <= next(
+        r for r in records if r["name"] == "area"
+    ).items()
+
+
+def test_export_module():
+    file = io.StringIO()
+    count = export(json, file)
+    assert count == len(file.getvalue().splitlines())
+    assert '"name": "dumps"' in file.getvalue()
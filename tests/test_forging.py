@@ -0,0 +1,125 @@
+from typing import List, Optional
+
+import pytest
+
+from peepdis.core import CallablePeeper, Peeper
+from peepdis.forging import (
+    ForgeError,
+    Forger,
+    candidate_args,
+    candidates_for,
+    recipe_key,
+)
+
+
+class Forgeable:
+    calls = 0
+
+    def __init__(self):
+        self.items_ = [1, 2, 3]
+
+    def add(self, a: int, b: int) -> int:
+        return a + b
+
+    def item(self, i):
+        Forgeable.calls += 1
+        return self.items_[i]
+
+    def shout(self, text: str, times: int = 2):
+        return text.upper() * times
+
+    def total(self, values: List[int]):
+        return sum(values)
+
+    def maybe(self, value: Optional[str]):
+        return value.upper()
+
+    def never(self, value):
+        raise RuntimeError("never works")
+
+    def mutate(self, value: int):
+        self.items_.append(value)
+        return len(self.items_)
+
+
+def test_candidates_for_annotations():
+    assert candidates_for(int)[0] == 0
+    assert candidates_for(List[int]) == [[0, 1, 2]]
+    assert "abc" in candidates_for(Optional[str])
+    assert None in candidates_for(Optional[str])
+
+
+def test_candidate_args_use_defaults_of_same_type():
+    first = next(candidate_args(Forgeable().shout, ["text"]))
+    assert first == {"text": "abc"}
+    values = [args["i"] for args in candidate_args(Forgeable().item, ["i"])]
+    assert values[0] == 0
+
+
+def test_forge_finds_arguments():
+    forger = Forger()
+    assert forger.forge(Forgeable().add, ["a", "b"]) == {"a": 0, "b": 0}
+    # None is tried before str for Optional[str], and fails on `.upper()`
+    assert forger.forge(Forgeable().maybe, ["value"]) == {"value": "abc"}
+    assert forger.forge(Forgeable().total, ["values"]) == {"values": [0, 1, 2]}
+
+
+def test_forge_is_memoized_per_type():
+    forger = Forger()
+    forger.forge(Forgeable().item, ["i"])
+    calls = Forgeable.calls
+    assert forger.forge(Forgeable().item, ["i"]) == {"i": 0}
+    assert Forgeable.calls == calls
+    assert (recipe_key(Forgeable().item), ("i",)) in forger.recipes
+
+
+def test_forge_budget():
+    forger = Forger(budget=3)
+    with pytest.raises(ForgeError):
+        forger.forge(Forgeable().never, ["value"])
+    # the failure is remembered too
+    with pytest.raises(ForgeError, match="cached"):
+        forger.forge(Forgeable().never, ["value"])
+
+
+def test_forge_isolates_attempts():
+    obj = Forgeable()
+    Forger().forge(obj.mutate, ["value"])
+    assert obj.items_ == [1, 2, 3]
+
+
+def test_forge_in_threads():
+    forger = Forger(executor="thread", workers=2)
+    assert forger.forge(Forgeable().item, ["i"]) == {"i": 0}
+    with pytest.raises(ValueError):
+        Forger(executor="process")
+
+
+def test_callable_peeper_forge_args():
+    peeper = CallablePeeper(Forgeable().add)
+    assert peeper._infer_types() == {"a": int, "b": int}
+    args = peeper.forge_args()
+    assert args == {"a": 0, "b": 0}
+    assert args.returns is int
+    assert args["a"].method == "forged"
+
+
+def test_peep_forge():
+    peeper = Peeper(Forgeable())
+    peeper.peep(forge=Forger())
+    assert peeper["add"].value == "0"
+    assert peeper["shout"].value == "'ABCABC'"
+    assert peeper["total"].value == "3"
+    assert not peeper["item"].error
+    assert peeper["never"].error
+
+
+def test_forge_positional_only_with_specified():
+    def scale(values, factor, /, *, offset=0):
+        return [v * factor + offset for v in values]
+
+    peeper = CallablePeeper(scale, [1, 2])
+    args = peeper.forge_args()
+    assert args["values"].method == "specified"
+    assert args["factor"].method == "forged"
+    assert peeper.evaluate().value == "[0, 0]"
@@ -1,2 +1,96 @@
 from peepdis.core import peep
+from peepdis import legacy
+import io
+import pytest
+import time
 
+
+class SlowMethodClass:
+    def slow(self):
+        time.sleep(1)
+
+    def fast(self):
+        return 5
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def increment(self):
+        self.count += 1
+        return self.count
+
+
+class Bag:
+    def __init__(self):
+        self.items = [1, 2]
+
+    def clear(self):
+        self.items = []
+
+    def size(self):
+        return len(self.items)
+
+
+class PropertyClass:
+    @property
+    def expensive(self):
+        return 1
+
+
+class BrokenPropertyClass:
+    @property
+    def connection(self):
+        raise RuntimeError("db down")
+
+    def fast(self):
+        return 5
+
+
+class TestPeep:
+    def test_timeout(self):
+        start = time.perf_counter()
+        output = str(legacy.peep(SlowMethodClass(), timeout=0.05))
+        assert time.perf_counter() - start < 0.5
+        assert "slow(): (timed out after 0.05s)" in output
+        assert "fast(): 5" in output
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_executor(self, executor):
+        output = str(legacy.peep(Counter(), executor=executor, workers=2))
+        assert output == "count: 0\nincrement(): 1\n"
+
+    @pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+    def test_isolated_per_member(self, executor):
+        # `clear()` must not be seen by `size()`, whichever executor runs them
+        output = str(legacy.peep(Bag(), executor=executor, workers=2))
+        assert output == "clear(): None\nitems: [1, 2]\nsize(): 2\n"
+
+    def test_fork_isolation(self):
+        counter = Counter()
+        output = str(legacy.peep(counter, isolation="fork"))
+        assert output == "count: 0\nincrement(): 1\n"
+        assert counter.count == 0
+
+    def test_file(self):
+        file = io.StringIO()
+        output = legacy.peep(Counter(), file=file)
+        assert file.getvalue() == "count: 0\nincrement(): 1\n"
+        assert str(output) == ""
+
+    def test_properties(self):
+        output = str(legacy.peep(PropertyClass()))
+        assert output == "expensive: (property, not evaluated)\n"
+        output = str(legacy.peep(PropertyClass(), properties=True))
+        assert output == "expensive: 1\n"
+
+    def test_raising_property(self):
+        output = str(legacy.peep(BrokenPropertyClass(), properties=True))
+        assert "connection: RAISES EXCEPTION : db down" in output
+        assert "fast(): 5" in output
+
+    def test_requires_arguments(self):
+        output = str(legacy.peep([3, 1]))
+        assert "insert(): (requires positional arguments)" in output
+        assert "index(): (requires positional arguments)" in output
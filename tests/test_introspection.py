@@ -0,0 +1,151 @@
+import gc
+import sys
+import types
+
+import pytest
+
+from peepdis.core import Peeper
+from peepdis.introspection import (
+    TypeCache,
+    classify,
+    get_signature,
+    member_names,
+    registered_for,
+    type_cache,
+)
+
+
+class Square:
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+    def area(self):
+        return self.a * self.b
+
+    def _private(self):
+        pass
+
+
+class PropertyClass:
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def expensive(self):
+        self.calls.append("expensive")
+        return 1
+
+    def method(self):
+        return 2
+
+    @staticmethod
+    def static():
+        return 3
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        return 4
+
+    def __dir__(self):
+        return ["dynamic"] + object.__dir__(self)
+
+
+class TestMemberNames:
+    @pytest.mark.parametrize("obj", [Square(1, 2), [1], "abc", Square, pytest])
+    def test_matches_dir(self, obj):
+        assert list(member_names(obj)) == sorted(dir(obj))
+
+    def test_instance_attrs(self):
+        sq = Square(1, 2)
+        sq.c = 3
+        assert "c" in member_names(sq)
+        assert "c" not in member_names(Square(1, 2))
+
+    def test_filters(self):
+        names = member_names(Square(1, 2), builtins=False, privates=False)
+        assert names == ("a", "area", "b")
+
+    def test_cached(self):
+        member_names(Square(1, 2))
+        assert Square in type_cache
+
+
+class TestTypeCache:
+    def test_weak(self):
+        cache = TypeCache()
+        cls = type("Temporary", (), {})
+        cache.get(cls)
+        assert len(cache) == 1
+        del cls
+        gc.collect()
+        assert len(cache) == 0
+
+    def test_lru(self):
+        cache = TypeCache(maxsize=2)
+        cache.get(int)
+        cache.get(str)
+        cache.get(int)
+        cache.get(float)
+        assert int in cache and float in cache
+        assert str not in cache
+
+    def test_invalidate(self):
+        cache = TypeCache()
+        cache.get(int)
+        cache.get(str)
+        cache.invalidate(int)
+        assert int not in cache and str in cache
+        cache.invalidate()
+        assert len(cache) == 0
+
+
+class TestClassify:
+    def test_kinds(self):
+        sq = Square(1, 2)
+        assert classify(sq, "a") == "attr"
+        assert classify(sq, "area") == "method"
+        assert classify(sq, "__sizeof__") == "builtin"
+        assert classify([], "append") == "builtin"
+        assert classify(1, "real") == "attr"
+
+    def test_properties_not_run(self):
+        obj = PropertyClass()
+        assert classify(obj, "expensive") == "property"
+        assert classify(obj, "dynamic") == "property"
+        assert classify(obj, "method") == "method"
+        assert classify(obj, "static") == "method"
+        assert obj.calls == []
+
+    def test_spec_not_mutated(self):
+        sq = Square(1, 2)
+        for _ in range(2):
+            peeper = Peeper(sq)
+            peeper.peep()
+            assert peeper.methods["area"] == "2"
+        assert list(get_signature(sq, "area", sq.area).parameters) == []
+
+
+class Wide(Square):
+    pass
+
+
+class TestRegisteredFor:
+    def test_most_specific(self):
+        registry = {f"{__name__}.Square": "square"}
+        assert registered_for(registry, Wide(1, 2)) == "square"
+        registry[f"{__name__}.Wide"] = "wide"
+        assert registered_for(registry, Wide(1, 2)) == "wide"
+        registry[f"{__name__}.Wide"] = "replaced"
+        assert registered_for(registry, Wide(1, 2)) == "replaced"
+        del registry[f"{__name__}.Wide"]
+        assert registered_for(registry, Wide(1, 2)) == "square"
+        assert registered_for(registry, 1) is None
+
+    def test_module_imported_later(self, monkeypatch):
+        registry = {"peepdis_fake.Square": "square"}
+        assert registered_for(registry, Square(1, 2)) is None
+        module = types.ModuleType("peepdis_fake")
+        module.Square = Square
+        monkeypatch.setitem(sys.modules, "peepdis_fake", module)
+        assert registered_for(registry, Square(1, 2)) == "square"
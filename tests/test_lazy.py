@@ -0,0 +1,62 @@
+import pytest
+
+from peepdis.lazy import LazyPeeper, Pager, browse
+
+
+class Wide:
+    evaluated = []
+
+    def __init__(self):
+        for i in range(50):
+            setattr(self, f"attr_{i:02}", i)
+
+    def first(self):
+        Wide.evaluated.append("first")
+        return 1
+
+    def second(self):
+        Wide.evaluated.append("second")
+        return 2
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    Wide.evaluated = []
+
+
+def test_evaluates_on_access():
+    peeper = LazyPeeper(Wide())
+    assert not peeper
+    assert peeper["first"].value == "1"
+    assert Wide.evaluated == ["first"]
+    peeper["first"]
+    assert Wide.evaluated == ["first"]
+    assert list(peeper.methods) == ["first"]
+    assert "second" in peeper.names
+
+
+def test_unknown_member():
+    with pytest.raises(KeyError):
+        LazyPeeper(Wide())["missing"]
+
+
+def test_pager_only_evaluates_shown_page():
+    pager = Pager(LazyPeeper(Wide()), page_size=10)
+    assert pager.n_pages == 6
+    lines = pager.render()
+    assert len(lines) == 11
+    assert "page 1 of 6, members 1-10 of 53" in lines[-1]
+    assert len(pager.peeper) == 10
+    lines = pager.render(5)
+    assert len(pager.peeper) == 13
+    assert Wide.evaluated == ["first", "second"]
+
+
+def test_browse(capsys):
+    pager = browse(Wide(), page_size=5)
+    assert "attr_00: 0" in capsys.readouterr().out
+    pager.next()
+    assert "attr_05: 5" in capsys.readouterr().out
+    assert pager.page == 1
+    with pytest.raises(IndexError):
+        pager.show(100)
@@ -1,5 +1,9 @@
-from peepdis.core import CallablePeeper, Peeper
+import asyncio
+import functools
+import operator
+from peepdis.core import CallablePeeper, Peeper, iter_peep
 import pytest
+import time
 
 # TODO: test idempotency of Peeper.peep
 class Square:
@@ -47,6 +51,14 @@ class ClassMethodClass(AttrClass):
         return cls(foo)
 
 
+class SlowMethodClass:
+    def slow(self):
+        time.sleep(1)
+
+    def fast(self):
+        return 5
+
+
 @pytest.fixture
 def attr_peeper():
     obj = AttrClass('bar')
@@ -117,7 +129,217 @@ class TestForging:
         pass
 """
 
+class TestTimeout:
+    def test_timed_out(self):
+        peeper = Peeper(SlowMethodClass())
+        start = time.perf_counter()
+        peeper.peep(timeout=0.05)
+        assert time.perf_counter() - start < 0.5
+        assert peeper["slow"].timed_out
+        assert peeper["slow"].output_type == "timeout"
+        assert not peeper["fast"].timed_out
+        assert peeper.methods["fast"] == "5"
+
+
+class TestExecutor:
+    @pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+    def test_executor(self, executor):
+        peeper = Peeper(Square(1, 2))
+        peeper.peep(executor=executor, workers=2)
+        assert peeper.attrs == {"a": 1, "b": 2, "name": None}
+        assert peeper.methods["area"] == "2"
+        assert list(peeper) == sorted(peeper)
+
+
+class NoCopyClass:
+    def __init__(self):
+        self.stack = [1, 2]
+
+    def take(self):
+        return self.stack.pop()
+
+    def __deepcopy__(self, memo):
+        raise TypeError("not copyable")
+
+
+class CallableAttrs:
+    def __init__(self):
+        self.double = functools.partial(operator.mul, 2)
+        self.label = functools.partial(str, 5)
+
+
+class TestCallableInstances:
+    def test_named_by_member(self):
+        peeper = Peeper(CallableAttrs())
+        peeper.peep()
+        assert peeper["label"].value == "'5'"
+        assert peeper["double"].args_missing
+
+
+class TestForkIsolation:
+    def test_fork(self):
+        obj = NoCopyClass()
+        peeper = Peeper(obj, isolation="fork")
+        peeper.peep(timeout=1)
+        assert peeper.methods["take"] == "2"
+        assert peeper.attrs["stack"] == "[1, 2]"
+        assert obj.stack == [1, 2]
+
+    def test_unknown_isolation(self):
+        with pytest.raises(ValueError):
+            Peeper(Square(1, 2), isolation="sandbox")
+
+
+class TestStreaming:
+    def test_iter_peep_progressive(self):
+        outputs = iter_peep(SlowMethodClass(), timeout=0.5)
+        start = time.perf_counter()
+        first = next(output for output in outputs if output.name == "fast")
+        assert first.value == "5"
+        assert time.perf_counter() - start < 0.25
+        names = [first.name] + [output.name for output in outputs]
+        assert "slow" in names
+
+    def test_print_peeps_once(self, capsys):
+        peeper = Peeper(Square(1, 2))
+        peeper.print()
+        streamed = capsys.readouterr().out
+        assert "area(): 2" in streamed
+        assert peeper.methods["area"] == "2"
+        peeper.print()
+        assert capsys.readouterr().out == streamed
+
+
+class PropertyClass:
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def expensive(self):
+        self.calls += 1
+        return self.calls
+
+    @property
+    def broken(self):
+        raise RuntimeError("no database")
+
+
+class TestProperties:
+    def test_not_evaluated(self):
+        peeper = Peeper(PropertyClass())
+        peeper.peep()
+        assert set(peeper.unevaluated) == {"broken", "expensive"}
+        assert peeper["expensive"].obj_type == "property"
+        assert peeper["expensive"].output_type == "null"
+
+    def test_opt_in(self):
+        peeper = Peeper(PropertyClass())
+        peeper.peep(properties=True)
+        assert peeper.attrs["expensive"] == 1
+        assert peeper["broken"].error
+        assert not peeper.unevaluated
+
+
+class CopyCountingClass:
+    copies = 0
+
+    def method(self, c, *args, d=1):
+        return c
+
+    def __deepcopy__(self, memo):
+        CopyCountingClass.copies += 1
+        return CopyCountingClass()
+
+
+class TestArity:
+    def test_skipped_without_copy(self):
+        peeper = Peeper(CopyCountingClass())
+        copies = CopyCountingClass.copies
+        output = peeper.evaluate("method")
+        assert CopyCountingClass.copies == copies
+        assert output.args_missing
+        assert output.value == "(missing args: 'c')"
+        assert list(output.args) == ["c", "d"]
+
+    def test_builtin(self):
+        peeper = Peeper([3, 1])
+        peeper.peep()
+        assert peeper["insert"].args_missing
+        assert peeper["insert"].value == "(missing args: 'index', 'object')"
+        assert peeper["copy"].value == "[3, 1]"
+
+
 class ColorSchemeTest:
     def test_color_scheme_update(self):
         pass
 
+
+
+class AsyncService:
+    def __init__(self):
+        self.name = "service"
+
+    async def health(self):
+        await asyncio.sleep(0.2)
+        return "ok"
+
+    async def stats(self):
+        await asyncio.sleep(0.2)
+        return {"requests": 1}
+
+    async def hangs(self):
+        await asyncio.sleep(10)
+
+    async def broken(self):
+        raise ValueError("down")
+
+    @property
+    def ready(self):
+        return asyncio.sleep(0, result=True)
+
+
+class TestAwaitables:
+    def test_not_awaited_by_default(self):
+        peeper = Peeper(AsyncService())
+        peeper.peep()
+        assert "health" in peeper.unevaluated
+        assert peeper["health"].value == "(awaitable, not awaited)"
+
+    def test_awaited_concurrently(self):
+        peeper = Peeper(AsyncService())
+        start = time.perf_counter()
+        peeper.peep(awaitables=True, timeout=1, properties=True)
+        elapsed = time.perf_counter() - start
+        assert peeper.methods["health"] == "'ok'"
+        assert peeper.methods["stats"] == "{'requests': 1}"
+        assert peeper["hangs"].timed_out
+        assert "down" in peeper["broken"].value
+        assert peeper.attrs["ready"] is True
+        # the sleeps overlap, so the slowest one sets the total
+        assert elapsed < 1.5
+
+    def test_callers_loop(self):
+        async def main():
+            peeper = Peeper(AsyncService())
+            await peeper.apeep(timeout=0.5)
+            return peeper
+
+        peeper = asyncio.run(main())
+        assert peeper.methods["health"] == "'ok'"
+
+    def test_inside_running_loop(self):
+        async def main():
+            return list(iter_peep(AsyncService(), awaitables=True, timeout=0.5))
+
+        outputs = {output.name: output for output in asyncio.run(main())}
+        assert outputs["stats"].value == "{'requests': 1}"
+
+    def test_options(self):
+        peeper = Peeper(AsyncService())
+        with pytest.raises(ValueError):
+            peeper.peep(awaitables=True, executor="thread")
+        outputs = list(
+            peeper.iter_peep(awaitables=True, timeout=0.5, profile=True, keep=False)
+        )
+        assert not peeper
+        assert all("peak_bytes" in output.timings for output in outputs)
@@ -0,0 +1,82 @@
+import gc
+import threading
+import time
+
+from peepdis import legacy
+from peepdis.core import Peeper
+from peepdis.profiling import MemberProfile, Profile, Timer, measure, tracing
+
+
+class SlowClass:
+    def __init__(self):
+        self.data = list(range(10))
+
+    def slow(self):
+        time.sleep(0.2)
+        return 1
+
+    def allocate(self):
+        return len([0] * 100_000)
+
+
+def _quiesce():
+    """ Wait for calls left running by timeouts in earlier tests, and collect
+    garbage, so that nothing is freed while a peak is measured
+    """
+    for thread in threading.enumerate():
+        if thread.daemon and thread is not threading.current_thread():
+            thread.join(5)
+    gc.collect()
+
+
+class TestTimer:
+    def test_phases_accumulate(self):
+        timer = Timer()
+        for _ in range(2):
+            with timer.phase("call"):
+                time.sleep(0.01)
+        assert timer.timings["call"] >= 0.02
+
+    def test_measure_peak(self):
+        timings = {}
+        with tracing(), measure(timings):
+            data = [0] * 100_000
+        assert timings["peak_bytes"] >= 800_000
+        assert timings["total"] > 0
+
+    def test_measure_untraced(self):
+        timings = {}
+        with measure(timings):
+            pass
+        assert "peak_bytes" not in timings
+
+
+class TestProfile:
+    def test_slowest(self):
+        profile = Profile(
+            MemberProfile(name, {"total": total})
+            for name, total in [("a", 1.0), ("b", 3.0), ("c", 2.0)]
+        )
+        assert [member.name for member in profile.slowest(2)] == ["b", "c"]
+        assert profile.to_dicts()[0]["total"] == 1.0
+        assert profile.table(1).splitlines()[1].startswith("b ")
+
+    def test_peeper(self):
+        peeper = Peeper(SlowClass())
+        _quiesce()
+        gc.disable()
+        try:
+            peeper.peep(profile=True)
+        finally:
+            gc.enable()
+        slowest = peeper.profile.slowest(2)
+        assert [member.name for member in slowest][0] == "slow"
+        assert slowest[0].call >= 0.05
+        assert peeper.profile.slowest(1)[0].copy > 0
+        allocate = next(m for m in peeper.profile if m.name == "allocate")
+        assert allocate.peak_bytes >= 800_000
+
+    def test_legacy(self):
+        output = legacy.peep(SlowClass(), profile=True)
+        assert "slowest members" in str(output)
+        assert output.profile.slowest(1)[0].name == "slow"
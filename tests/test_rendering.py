@@ -0,0 +1,83 @@
+import io
+import sys
+
+import pytest
+from termcolor import colored
+
+from peepdis.rendering import (
+    LineBuffer,
+    color_enabled,
+    colorize,
+    colorize_as,
+    set_color,
+    shorten,
+)
+
+
+@pytest.fixture
+def force_color(monkeypatch):
+    monkeypatch.setenv("FORCE_COLOR", "1")
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    set_color(None)
+    yield
+    monkeypatch.undo()
+    set_color(None)
+
+
+@pytest.mark.usefixtures("force_color")
+class TestColorize:
+    @pytest.mark.parametrize("color", ["red", "grey", "cyan"])
+    def test_matches_termcolor(self, color):
+        assert colorize("abc", color) == colored("abc", color)
+
+    def test_non_str(self):
+        assert colorize(None, "red") == colored("None", "red")
+
+    def test_colorize_as(self):
+        assert colorize_as("abc", "error") == colored("abc", "red")
+
+
+class TestShorten:
+    @pytest.mark.parametrize("max_len", [None, 0, 1, 3, 4, 5, 8, 100])
+    def test_matches_join_then_truncate(self, max_len):
+        fragments = ("ab", "cd", "", "efgh")
+        expected = "".join(fragments)
+        if max_len and len(expected) > max_len:
+            expected = expected[:max_len] + " ..."
+        assert shorten(*fragments, max_len=max_len) == expected
+
+
+class TestLineBuffer:
+    def test_buffered(self):
+        buffer = LineBuffer()
+        buffer.add("a")
+        buffer.add("b")
+        file = io.StringIO()
+        buffer.write(file)
+        assert file.getvalue() == buffer.getvalue() == "a\nb\n"
+
+    def test_streamed(self):
+        file = io.StringIO()
+        buffer = LineBuffer(file)
+        buffer.add("a")
+        assert file.getvalue() == "a\n"
+        assert buffer.getvalue() == ""
+
+
+class TestColorEnabled:
+    def test_not_a_terminal(self, monkeypatch):
+        for name in ("FORCE_COLOR", "NO_COLOR", "ANSI_COLORS_DISABLED"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setattr(sys, "stdout", io.StringIO())
+        assert not color_enabled()
+        assert colorize("abc", "red") == "abc"
+
+    def test_no_color(self, monkeypatch, force_color):
+        monkeypatch.setenv("NO_COLOR", "1")
+        set_color(None)
+        assert colorize("abc", "red") == "abc"
+
+    def test_forced(self, force_color):
+        assert "\x1b[" in colorize("abc", "red")
+        set_color(False)
+        assert colorize("abc", "red") == "abc"
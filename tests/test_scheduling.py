@@ -0,0 +1,92 @@
+import re
+import time
+
+import pytest
+
+from peepdis import legacy
+from peepdis.core import Peeper
+from peepdis.scheduling import CostModel, cheapest_first, cost_model, overdue_message
+from peepdis.store import MemberRecord
+
+
+class Slow:
+    ready = True
+
+    def __init__(self):
+        self.size = 3
+
+    def quick(self):
+        return 1
+
+    def sleepy(self):
+        time.sleep(0.5)
+        return 2
+
+    def zzz(self):
+        return 3
+
+
+@pytest.fixture(autouse=True)
+def clear_costs():
+    cost_model.clear()
+    yield
+    cost_model.clear()
+
+
+def test_cost_model():
+    costs = CostModel(weight=0.5)
+    assert costs.expected("T", "a") is None
+    costs.observe("T", "a", 1.0)
+    costs.observe("T", "a", 3.0)
+    assert costs.expected("T", "a") == 2.0
+    costs.observe("T", "a", 0.5, timed_out=True)
+    assert costs.expected("T", "a") == 2.0
+
+
+def test_cheapest_first():
+    costs = CostModel()
+    costs.observe("T", "sleepy", 0.5)
+    costs.observe("T", "zzz", 0.001)
+    names = ["quick", "ready", "size", "sleepy", "zzz"]
+    order = cheapest_first(Slow(), names, "T", costs=costs)
+    assert order[:2] == ["ready", "size"]
+    assert order[-1] == "sleepy"
+    assert order.index("zzz") < order.index("quick")
+    history = {"quick": MemberRecord(None, 1.0, None, None, 0)}
+    order = cheapest_first(Slow(), names, "T", history, costs=costs)
+    assert order[-1] == "quick"
+
+
+def test_peeper_deadline(capsys):
+    peeper = Peeper(Slow())
+    start = time.monotonic()
+    peeper.print(deadline=0.2)
+    assert time.monotonic() - start < 0.4
+    assert peeper["size"].value == 3
+    assert peeper["sleepy"].timed_out
+    # the timeout cut to the time left is rounded
+    assert re.fullmatch(r"\(timed out after 0\.\d{1,3}s\)", peeper["sleepy"].value)
+    assert peeper.overdue == ["zzz"]
+    assert peeper.unevaluated["zzz"] == overdue_message
+    out = capsys.readouterr().out
+    assert "deadline passed before 1 members were evaluated: zzz" in out
+    # members left over from an earlier deadline aren't reported again
+    peeper.peep()
+    assert peeper.overdue == []
+
+
+def test_peeper_deadline_learns_costs():
+    Peeper(Slow()).peep(deadline=0.2)
+    peeper = Peeper(Slow())
+    peeper.peep(deadline=0.2)
+    # sleepy timed out last time, so everything else is evaluated first
+    assert not peeper.overdue
+    assert peeper["zzz"].value == "3"
+    assert peeper["sleepy"].timed_out
+
+
+def test_legacy_deadline():
+    output = str(legacy.peep(Slow(), deadline=0.0))
+    assert "deadline passed before" in output
+    assert f"zzz(): {overdue_message}" in output
+    assert f"size: {overdue_message}" in output
@@ -0,0 +1,91 @@
+import pytest
+
+from peepdis.core import Peeper
+from peepdis.forging import Forger
+from peepdis.introspection import type_key
+from peepdis.store import MemberRecord, MemberStore, type_version
+
+
+class Remembered:
+    calls = 0
+
+    def __init__(self):
+        self.values = [1, 2, 3]
+
+    def item(self, i):
+        Remembered.calls += 1
+        return self.values[i]
+
+    def broken(self):
+        Remembered.calls += 1
+        raise RuntimeError("broken")
+
+    def grow(self):
+        self.values.append(4)
+        return len(self.values)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MemberStore(tmp_path / "cache" / "store.sqlite3")
+
+
+def test_record_and_load(store):
+    record = MemberRecord({"i": 0}, 0.5, None, True, 1.0)
+    store.record("mod.Type", "1.0", {"item": record})
+    assert store.load("mod.Type", "1.0") == {"item": record}
+    assert store.load("mod.Other", "1.0") == {}
+
+
+def test_other_version_is_dropped(store):
+    store.record("mod.Type", "1.0", {"item": MemberRecord(None, 0.5, None, None, 1)})
+    assert store.load("mod.Type", "2.0") == {}
+    assert store.load("mod.Type", "1.0") == {}
+
+
+def test_forget(store):
+    store.record("mod.Type", "", {"item": MemberRecord(None, 0.5, None, None, 1)})
+    store.forget("mod.Type")
+    assert store.load("mod.Type", "") == {}
+
+
+def test_type_key_and_version():
+    assert type_key(Remembered()) == f"{__name__}.Remembered"
+    assert type_key(pytest) == "pytest"
+    assert type_version(pytest) == pytest.__version__
+    assert type_version(Remembered()) == ""
+
+
+def test_peeper_records_members(store):
+    peeper = Peeper(Remembered(), store=store)
+    peeper.peep(forge=Forger(), track=True)
+    records = store.load(type_key(Remembered()), "")
+    assert records["item"].args == {"i": 0}
+    assert records["broken"].error == "RuntimeError('broken')"
+    assert records["grow"].mutated is True
+    assert records["values"].latency is not None
+
+
+def test_peeper_reuses_records(store):
+    Peeper(Remembered(), store=store).peep(forge=Forger())
+    calls = Remembered.calls
+    peeper = Peeper(Remembered(), store=store)
+    peeper.peep(forge=Forger())
+    # the arguments are reused without a search, and the failure is skipped
+    assert Remembered.calls == calls + 1
+    assert peeper["item"].value == "1"
+    assert "skipped" in peeper.unevaluated["broken"]
+
+
+def test_failures_expire(store):
+    Peeper(Remembered(), store=store).peep()
+    record = store.load(type_key(Remembered()), "")["broken"]
+    assert store.failed_recently(record)
+    assert not store.failed_recently(record, now=record.updated + store.retry_after)
+    calls = Remembered.calls
+    retrying = MemberStore(store.path, retry_after=0)
+    peeper = Peeper(Remembered(), store=retrying)
+    peeper.peep()
+    assert Remembered.calls == calls + 1
+    assert peeper["broken"].error
+    assert retrying.load(type_key(Remembered()), "")["broken"].updated > record.updated
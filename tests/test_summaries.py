@@ -0,0 +1,81 @@
+import pytest
+
+from peepdis import legacy
+from peepdis.core import Peeper
+from peepdis.rendering import bounded_repr
+from peepdis.summaries import _summarizers, register_summarizer, summarize
+
+
+class BigFrame:
+    def __init__(self, n):
+        self.n = n
+
+    def __repr__(self):
+        raise AssertionError("the full repr should never be built")
+
+    __str__ = __repr__
+
+
+def _summarize_big_frame(frame):
+    return f"BigFrame n={frame.n}"
+
+
+register_summarizer(f"{__name__}.BigFrame", _summarize_big_frame)
+
+
+class Holder:
+    def __init__(self):
+        self.frame = BigFrame(10)
+
+    def make(self):
+        return BigFrame(20)
+
+
+def test_known_types_registered_by_name():
+    assert {"numpy.ndarray", "pandas.DataFrame", "pandas.Series"} <= set(_summarizers)
+    assert summarize([1, 2, 3]) is None
+
+
+def test_summarize():
+    assert summarize(BigFrame(5)) == "BigFrame n=5"
+    assert bounded_repr(BigFrame(5)) == "BigFrame n=5"
+
+
+def test_failing_summarizer_falls_back():
+    class Odd:
+        pass
+
+    register_summarizer(f"{__name__}.{Odd.__qualname__}", lambda value: 1 / 0)
+    assert summarize(Odd()) is None
+
+
+def test_core_uses_summaries():
+    peeper = Peeper(Holder())
+    peeper.peep()
+    assert peeper.methods["make"] == "BigFrame n=20"
+    assert "BigFrame n=10" in peeper["frame"].render()
+
+
+def test_legacy_uses_summaries():
+    output = str(legacy.peep(Holder()))
+    assert "frame: BigFrame n=10" in output
+    assert "make(): BigFrame n=20" in output
+
+
+def test_numpy(tmp_path):
+    np = pytest.importorskip("numpy")
+    assert summarize(np.arange(10)) is None
+    summary = summarize(np.arange(2000.0))
+    assert summary.startswith("ndarray shape=(2000,) dtype=float64")
+    assert "min=0 max=1999 mean=999.5" in summary
+    memmap = np.memmap(tmp_path / "values", dtype="int64", mode="w+", shape=(2000,))
+    assert summarize(memmap).startswith("memmap shape=(2000,) dtype=int64")
+
+
+def test_pandas():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"a": range(2000), "b": ["x"] * 2000})
+    summary = summarize(df)
+    assert summary.startswith("DataFrame shape=(2000, 2)")
+    assert "  a: int64 nulls=0 min=0 max=1999 mean=999.5" in summary
+    assert summarize(df["a"]).startswith("Series name='a' length=2000 dtype=int64")
@@ -0,0 +1,106 @@
+from peepdis.core import Peeper
+from peepdis.tracking import describe_change, snapshot, state_change
+
+
+class Account:
+    def __init__(self):
+        self.balance = 10
+        self.history = [10]
+        self.owner = "ann"
+
+    def deposit_all(self):
+        self.balance += 5
+        self.history.append(5)
+
+    def close(self):
+        del self.owner
+        self.closed = True
+
+    def report(self):
+        return self.balance
+
+
+def test_state_change():
+    account = Account()
+    reference = Account()
+    before = snapshot(account)
+    account.deposit_all()
+    change = state_change(before, account, reference)
+    assert set(change.modified) == {"balance", "history"}
+    assert change.modified["balance"] == "10 -> 15"
+    assert change.modified["history"] == "length 1 -> 2"
+    assert not change.added and not change.removed
+
+
+def test_state_change_added_and_removed():
+    account = Account()
+    before = snapshot(account)
+    account.close()
+    change = state_change(before, account, Account())
+    assert change.added == {"closed": "True"}
+    assert change.removed == {"owner": "'ann'"}
+
+
+def test_unchanged():
+    account = Account()
+    before = snapshot(account)
+    account.report()
+    assert not state_change(before, account)
+    assert state_change(snapshot(object()), object()) is None
+
+
+def test_describe_change():
+    assert describe_change({"a": 1}, {"a": 2, "b": 3}) == (
+        "1 keys added, 0 removed, 1 changed"
+    )
+    assert describe_change([1, 2], [1, 3]) == "1 of 2 items changed"
+    assert describe_change({1}, {2, 3}) == "2 added, 1 removed"
+
+
+def test_peeper_track():
+    account = Account()
+    peeper = Peeper(account)
+    peeper.peep(track=True)
+    change = peeper["deposit_all"].state_change
+    assert set(change.modified) == {"balance", "history"}
+    assert not peeper["report"].state_change
+    assert "changed balance: 10 -> 15" in peeper["deposit_all"].render()
+    # evaluated on copies, so the object itself is untouched
+    assert account.balance == 10
+
+
+def test_peeper_track_fork():
+    peeper = Peeper(Account(), isolation="fork")
+    peeper.peep(track=True)
+    change = peeper["deposit_all"].state_change
+    assert change.modified["balance"] == "now 15"
+
+
+class Config:
+    def __init__(self):
+        self.lr = 0.1
+
+
+class Trainer:
+    def __init__(self):
+        self.cfg = Config()
+        self.hist = {"loss": [1.0]}
+
+    def tune(self):
+        self.cfg.lr = 0.5
+
+    def step(self):
+        self.hist["loss"].append(0.5)
+
+    def nothing(self):
+        return self.cfg.lr
+
+
+def test_nested_changes():
+    peeper = Peeper(Trainer())
+    peeper.peep(track=True)
+    assert set(peeper["tune"].state_change.modified) == {"cfg"}
+    assert peeper["step"].state_change.modified == {
+        "hist": "0 keys added, 0 removed, 1 changed"
+    }
+    assert not peeper["nothing"].state_change
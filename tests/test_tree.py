@@ -0,0 +1,78 @@
+from peepdis.tree import contains, is_type, name_matches, peep_tree, walk
+
+
+class Config:
+    def __init__(self):
+        self.timeout = 30
+        self.hosts = ["alpha", "beta"]
+        self._secret = "hunter2"
+
+
+class Client:
+    def __init__(self, manager):
+        self.config = Config()
+        self.manager = manager
+
+    @property
+    def exploding(self):
+        raise AssertionError("properties must not be evaluated")
+
+
+class Manager:
+    def __init__(self):
+        self.clients = {"east": Client(self), "west": Client(self)}
+        self.readings = [67, 69, 70]
+
+
+def test_walk_breadth_first_without_cycles():
+    manager = Manager()
+    nodes = list(walk(manager, depth=10))
+    depths = [node.depth for node in nodes]
+    assert depths == sorted(depths)
+    # each client refers back to the manager, which is only visited once
+    assert sum(node.value is manager for node in nodes) == 1
+    paths = {node.path for node in nodes}
+    assert "obj.clients['east'].config.hosts[1]" in paths
+    assert not any("_secret" in path for path in paths)
+
+
+def test_depth():
+    result = peep_tree(Manager(), depth=1)
+    assert {node.path for node in result} == {"obj", "obj.clients", "obj.readings"}
+
+
+def test_where():
+    result = peep_tree(Manager(), depth=5, where=name_matches("^timeout$"))
+    assert [node.path for node in result] == [
+        "obj.clients['east'].config.timeout",
+        "obj.clients['west'].config.timeout",
+    ]
+    assert "2 matches" in str(result)
+
+
+def test_first_match():
+    result = peep_tree(Manager(), depth=5, where=contains(69), first=True)
+    assert [node.path for node in result] == ["obj.readings"]
+    assert result.visited == 3
+
+
+def test_combined_predicates():
+    where = is_type(list) & ~name_matches("readings")
+    result = peep_tree(Manager(), depth=5, where=where)
+    assert {node.key for node in result} == {"hosts"}
+
+
+def test_budgets():
+    result = peep_tree(Manager(), depth=10, max_nodes=4)
+    assert result.visited == 4
+    assert result.stopped == "node"
+    result = peep_tree(Manager(), depth=10, max_bytes=1)
+    assert result.stopped == "memory"
+
+
+def test_large_graph():
+    root = []
+    for i in range(200_000):
+        root.append([i])
+    result = peep_tree(root, depth=2, where=contains(199_999), max_nodes=10 ** 6)
+    assert [node.path for node in result] == ["obj[199999]"]
@@ -0,0 +1,133 @@
+from peepdis.introspection import member_dependencies
+from peepdis.watch import Watcher, watch
+
+
+class Model:
+    def __init__(self):
+        self.weights = [1, 2]
+        self.name = "model"
+        self.calls = {"total": 0, "label": 0}
+
+    def total(self):
+        Model.calls["total"] += 1
+        return sum(self.weights)
+
+    def label(self):
+        Model.calls["label"] += 1
+        return self.title()
+
+    def title(self):
+        return self.name.title()
+
+
+Model.calls = {"total": 0, "label": 0}
+
+
+def test_member_dependencies():
+    model = Model()
+    assert {"weights"} <= member_dependencies(model, "total")
+    assert "weights" not in member_dependencies(model, "label")
+    # followed through the call to `title`
+    assert "name" in member_dependencies(model, "label")
+    assert member_dependencies(model, "__repr__") is None
+
+
+def test_refresh_unchanged(capsys):
+    model = Model()
+    watcher = watch(model)
+    assert "total" in capsys.readouterr().out
+    Model.calls = {"total": 0, "label": 0}
+    changes = watcher.refresh()
+    assert not changes
+    assert capsys.readouterr().out == ""
+    assert Model.calls == {"total": 0, "label": 0}
+
+
+def test_refresh_reevaluates_dependents_only(capsys):
+    model = Model()
+    watcher = Watcher(model)
+    watcher.refresh(quiet=True)
+    Model.calls = {"total": 0, "label": 0}
+    model.weights.append(3)
+    changes = watcher.refresh()
+    assert Model.calls == {"total": 1, "label": 0}
+    assert set(changes.modified) >= {"weights", "total"}
+    assert watcher["total"].value == "6"
+    out = capsys.readouterr().out
+    assert "~ total" in out
+    assert "label" not in out
+
+
+def test_refresh_added_and_removed(capsys):
+    model = Model()
+    watcher = Watcher(model)
+    watcher.refresh(quiet=True)
+    model.extra = 1
+    del model.name
+    changes = watcher.refresh()
+    assert "extra" in changes.added
+    assert "name" in changes.removed
+    assert "name" not in watcher
+    assert watcher.attrs["extra"] == 1
+    out = capsys.readouterr().out
+    assert "+ extra" in out
+    assert "- name" in out
+
+
+class Listing:
+    def __init__(self):
+        self.n = 500
+        self.tag = "a"
+
+    def listing(self):
+        return list(range(self.n)) if self.tag else []
+
+
+def test_refresh_long_result_unchanged():
+    listing = Listing()
+    watcher = Watcher(listing)
+    watcher.refresh(quiet=True)
+    listing.tag = "b"
+    changes = watcher.refresh(quiet=True)
+    assert "tag" in changes.modified
+    assert "listing" not in changes.modified
+
+
+def test_refresh_skips_builtins_unless_verbose():
+    model = Model()
+    watcher = Watcher(model)
+    watcher.refresh(quiet=True)
+    assert "__repr__" not in watcher
+    model.name = "other"
+    changes = watcher.refresh(quiet=True)
+    assert not any(name.startswith("__") for name in changes.modified)
+
+
+def test_refresh_ignores_identity():
+    model = Model()
+    watcher = Watcher(model, verbose=True)
+    watcher.refresh(quiet=True)
+    model.name = "other"
+    changes = watcher.refresh(quiet=True)
+    assert {"name", "label", "__getstate__"} <= set(changes.modified)
+    assert not {"__repr__", "__str__", "__hash__"} & set(changes.modified)
+
+
+class Settings:
+    def __init__(self):
+        self.rate = 1
+        self.log = ["start"]
+
+
+def test_refresh_attributes_without_copying():
+    settings = Settings()
+    watcher = Watcher(settings)
+    watcher.refresh(quiet=True)
+    copy = watcher.obj
+    settings.log.append("step")
+    changes = watcher.refresh(quiet=True)
+    assert set(changes.modified) == {"log"}
+    assert watcher.obj is copy
+    # the output keeps its value after the source changes again
+    settings.log.append("stop")
+    assert watcher["log"].value == "['start', 'step']"